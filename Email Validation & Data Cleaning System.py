@@ -14,6 +14,7 @@ from urllib.parse import urlparse
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
+from http_pool import get_shared_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -25,6 +26,7 @@ class AdvancedEmailValidatorAndCleaner:
         self.validation_results = {}
         self.cleaned_data = []
         self.report_data = {}
+        self.http = get_shared_pool()
         
         # Email validation patterns
         self.email_patterns = {
@@ -108,11 +110,11 @@ class AdvancedEmailValidatorAndCleaner:
             
             # Simple HTTP request to check if domain exists
             try:
-                response = requests.head(f"http://{domain}", timeout=5)
+                response = self.http.head(f"http://{domain}", timeout=5)
                 return {'valid': True, 'reason': 'Domain accessible'}
             except:
                 try:
-                    response = requests.head(f"https://{domain}", timeout=5)
+                    response = self.http.head(f"https://{domain}", timeout=5)
                     return {'valid': True, 'reason': 'Domain accessible (HTTPS)'}
                 except:
                     # Fallback to basic domain format check
@@ -1,20 +1,26 @@
-from flask import Flask, render_template_string, request, jsonify, send_file
+from flask import Flask, Response, render_template_string, request, jsonify, send_file, stream_with_context
 import os
-import json
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import pandas as pd
 from datetime import datetime
-import requests
 import re
 import random
-from bs4 import BeautifulSoup
-from urllib.parse import quote, urljoin
+from urllib.parse import quote
 import logging
 from io import BytesIO
 import urllib3
-import sqlite3
 from werkzeug.serving import WSGIRequestHandler
+from contact_extractor import ContactExtractor, ContactPrefilter, EMAIL_BLACKLIST, PHONE_PATTERNS
+from contact_memo import ContactMemo
+from html_parser import configure_backend, find_results, is_duckduckgo_result, make_soup, result_soup
+from http_pool import get_shared_pool
+from parse_pool import ParsePool, extract_page
+from progress_events import ProgressBroadcaster
+from search_cache import SearchCache
+from supplier_db import SupplierDB, SupplierWriter
+from url_utils import canonicalize_url, dedupe_urls
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -23,6 +29,10 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Resolve $HTML_PARSER_BACKEND up front: a bad value is logged once here
+# instead of failing inside every parse
+configure_backend()
+
 # Disable Flask request logging in production
 class QuietWSGIRequestHandler(WSGIRequestHandler):
     def log_request(self, code='-', size='-'):
@@ -31,15 +41,33 @@ class QuietWSGIRequestHandler(WSGIRequestHandler):
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'supplier-intelligence-pro-2024')
 
+# Record fields shown in the dashboard results table
+RESULT_TABLE_FIELDS = ('company_name', 'email', 'phone', 'website', 'commodity', 'quality_score', 'source')
+MAX_RESULTS_PAGE = 500
+
 class ProfessionalSupplierScraper:
-    def __init__(self):
+    def __init__(self, search_cache_ttl=7 * 24 * 3600, max_page_bytes=512 * 1024, contact_memo_file=None, parse_workers=0):
         self.collected_data = []
+        self.quality_total = 0  # Running sum of quality_score over collected_data
         self.is_running = False
         self.progress = 0
         self.current_commodity = ""
         self.total_commodities = 0
         self.status_message = "Ready to start..."
         self.thread = None
+        # Live progress for the dashboard's event streams; at most 8 of the
+        # Procfile's 16 gunicorn threads, the rest stay free for requests
+        self.events = ProgressBroadcaster(max_subscribers=8)
+        self.http = get_shared_pool()
+        self.search_cache = SearchCache(ttl=search_cache_ttl)
+        self.max_page_bytes = max_page_bytes  # Byte budget per deep-scraped page
+        self.contact_memo = ContactMemo(contact_memo_file)  # Deep-scraped contacts per site, reused across commodities
+        self.fetches_avoided = 0  # Deep-scrape fetches skipped as duplicate URLs
+        # Also drops support@example addresses; US phone formats only
+        self.extractor = ContactExtractor(blacklist=EMAIL_BLACKLIST + ('support@example',), phone_patterns=PHONE_PATTERNS[:6])
+        self.prefilter = ContactPrefilter()  # Skips extraction on pages with no contact signals
+        # Pipeline mode: parse fetched pages in worker processes, off the scraping thread
+        self.parse_pool = ParsePool(max_workers=parse_workers) if parse_workers > 0 else None
         self.init_db()
         
         # Complete commodities list from your original script
@@ -89,54 +117,27 @@ class ProfessionalSupplierScraper:
         }
 
     def init_db(self):
-        """Initialize SQLite database with proper schema"""
+        """Open the persistent WAL-mode connections and ensure the schema"""
         try:
-            conn = sqlite3.connect('suppliers.db', check_same_thread=False)
-            c = conn.cursor()
-            
-            # Create suppliers table
-            c.execute('''CREATE TABLE IF NOT EXISTS suppliers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_name TEXT NOT NULL,
-                email TEXT,
-                phone TEXT,
-                website TEXT,
-                commodity TEXT NOT NULL,
-                source TEXT NOT NULL,
-                snippet TEXT,
-                quality_score INTEGER DEFAULT 50,
-                collection_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(company_name, commodity)
-            )''')
-            
-            conn.commit()
-            conn.close()
+            self.db = SupplierDB('suppliers.db')
+            # Writes happen on a background thread, not between scraping steps
+            self.db_writer = SupplierWriter(self.db)
             logger.info("Database initialized successfully")
         except Exception as e:
+            self.db = None
+            self.db_writer = None
             logger.error(f"Database initialization error: {e}")
 
-    def save_to_db(self, supplier_data):
-        """Save supplier data to database"""
-        try:
-            conn = sqlite3.connect('suppliers.db', check_same_thread=False)
-            c = conn.cursor()
-            
-            c.execute('''INSERT OR REPLACE INTO suppliers 
-                         (company_name, email, phone, website, commodity, source, snippet, quality_score) 
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                     (supplier_data['company_name'], 
-                      supplier_data.get('email'),
-                      supplier_data.get('phone'), 
-                      supplier_data.get('website'),
-                      supplier_data['commodity'], 
-                      supplier_data['source'],
-                      supplier_data.get('snippet', ''),
-                      supplier_data.get('quality_score', 50)))
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Database save error: {e}")
+    def save_to_db(self, records):
+        """Queue a commodity's supplier records for the background writer"""
+        if self.db_writer is None:
+            return
+        self.db_writer.put_many(records)
+
+    def flush_db(self):
+        """Wait until every queued record is committed"""
+        if self.db_writer is not None:
+            self.db_writer.flush()
 
     def get_headers(self):
         """Get randomized headers to avoid blocking"""
@@ -155,51 +156,11 @@ class ProfessionalSupplierScraper:
 
     def extract_emails_from_text(self, text):
         """Extract email addresses from text"""
-        if not text:
-            return []
-        
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-        emails = re.findall(email_pattern, text, re.IGNORECASE)
-        
-        # Filter out fake emails
-        filtered_emails = []
-        for email in emails:
-            email_lower = email.lower()
-            if not any(skip in email_lower for skip in [
-                'noreply', 'no-reply', 'donotreply', 'info@example', 'test@', 'admin@example',
-                'webmaster@', 'postmaster@', 'abuse@', 'privacy@example', 'support@example'
-            ]):
-                filtered_emails.append(email)
-        
-        return list(set(filtered_emails))
+        return self.extractor.extract_emails(text)
 
     def extract_phones_from_text(self, text):
         """Extract phone numbers from text"""
-        if not text:
-            return []
-        
-        phone_patterns = [
-            r'\+1[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
-            r'\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
-            r'[0-9]{3}-[0-9]{3}-[0-9]{4}',
-            r'[0-9]{3}\.[0-9]{3}\.[0-9]{4}',
-            r'\([0-9]{3}\)\s[0-9]{3}-[0-9]{4}',
-            r'[0-9]{10}'
-        ]
-        
-        phones = []
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            phones.extend(matches)
-        
-        # Clean and validate
-        cleaned_phones = []
-        for phone in phones:
-            cleaned = re.sub(r'[^\d+]', '', phone)
-            if len(cleaned) >= 10:
-                cleaned_phones.append(phone.strip())
-        
-        return list(set(cleaned_phones))
+        return self.extractor.extract_phones(text)
 
     def get_search_terms_for_commodity(self, commodity):
         """Get optimized search terms for a commodity"""
@@ -228,22 +189,28 @@ class ProfessionalSupplierScraper:
         """Enhanced DuckDuckGo search scraping"""
         try:
             enhanced_query = f"{query} USA contact email phone"
+            
+            cached_results = self.search_cache.get('duckduckgo', enhanced_query)
+            if cached_results is not None:
+                logger.info(f"DuckDuckGo: {len(cached_results)} cached results for '{query[:50]}...'")
+                return cached_results[:max_results]
+            
             search_url = f"https://duckduckgo.com/html/?q={quote(enhanced_query)}"
             
             headers = self.get_headers()
             headers['Referer'] = 'https://duckduckgo.com/'
             
-            response = requests.get(search_url, headers=headers, timeout=15, verify=False)
+            response = self.http.get(search_url, headers=headers, timeout=15, verify=False)
             
             if response.status_code != 200:
                 logger.warning(f"DuckDuckGo search failed with status: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = result_soup(response.content, is_duckduckgo_result)
             results = []
             
             # DuckDuckGo result containers
-            search_results = soup.find_all('div', class_='result')[:max_results]
+            search_results = find_results(soup, is_duckduckgo_result)[:max_results]
             
             for result in search_results:
                 try:
@@ -252,10 +219,11 @@ class ProfessionalSupplierScraper:
                     
                     if title_elem:
                         title = title_elem.get_text().strip()
-                        link = title_elem.get('href', '')
+                        # Unwraps //duckduckgo.com/l/?uddg= redirects and drops tracking parameters
+                        link = canonicalize_url(title_elem.get('href', ''))
                         snippet = snippet_elem.get_text() if snippet_elem else ''
                         
-                        if not link.startswith('http'):
+                        if not link:
                             continue
                         
                         # Extract contact info
@@ -281,6 +249,7 @@ class ProfessionalSupplierScraper:
                     logger.debug(f"Error processing DuckDuckGo result: {e}")
                     continue
             
+            self.search_cache.put('duckduckgo', enhanced_query, results)
             logger.info(f"DuckDuckGo: Found {len(results)} results for '{query[:50]}...'")
             return results
             
@@ -301,13 +270,19 @@ class ProfessionalSupplierScraper:
             all_results = []
             
             for query in search_queries:
+                cached_results = self.search_cache.get('thomasnet', query)
+                if cached_results is not None:
+                    all_results.extend(cached_results)
+                    continue
+                
+                query_results = []
                 search_url = f"https://www.thomasnet.com/search.html?cov=NA&what={quote(query)}"
                 
                 headers = self.get_headers()
-                response = requests.get(search_url, headers=headers, timeout=15, verify=False)
+                response = self.http.get(search_url, headers=headers, timeout=15, verify=False)
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    soup = make_soup(response.content)
                     
                     # Look for supplier listings
                     suppliers = soup.find_all(['div', 'li'], class_=re.compile(r'supplier|company|listing'))
@@ -329,9 +304,7 @@ class ProfessionalSupplierScraper:
                                 
                                 # Try to find website link
                                 website_link = supplier.find('a', href=True)
-                                website = website_link['href'] if website_link else None
-                                if website and not website.startswith('http'):
-                                    website = urljoin('https://www.thomasnet.com', website)
+                                website = canonicalize_url(website_link['href'], base='https://www.thomasnet.com') if website_link else None
                                 
                                 result_data = {
                                     'company_name': company_name,
@@ -342,11 +315,12 @@ class ProfessionalSupplierScraper:
                                     'source': 'ThomasNet Directory'
                                 }
                                 
-                                all_results.append(result_data)
+                                query_results.append(result_data)
                         except:
                             continue
-                
-                time.sleep(random.uniform(2, 4))  # Respectful delay
+                    
+                    self.search_cache.put('thomasnet', query, query_results)
+                    all_results.extend(query_results)
             
             logger.info(f"ThomasNet: Found {len(all_results)} results for '{commodity}'")
             return all_results
@@ -355,60 +329,79 @@ class ProfessionalSupplierScraper:
             logger.error(f"Error scraping ThomasNet: {e}")
             return []
 
+    def extract_page(self, content, page_url, link_limit=0):
+        """Parse a fetched page for contacts (and contact links), in the parse pool if enabled"""
+        if self.parse_pool is not None:
+            result = self.parse_pool.extract(content, page_url, link_limit, self.extractor)
+        else:
+            result = extract_page(content, page_url, link_limit, self.extractor)
+        self.prefilter.record(result['signals'], result['size'])
+        return result
+
     def scrape_website_contact_info(self, url, company_name):
         """Enhanced website contact scraping"""
+        return self._scrape_contacts(url, company_name)[1]
+
+    def _scrape_contacts(self, url, company_name):
+        """(fetched, contact info): fetched is False when the site couldn't be read
+        (network error, non-200 status), as opposed to read with no contacts on it"""
         try:
             if not url or not url.startswith('http'):
-                return None
+                return True, None
             
             headers = self.get_headers()
-            response = requests.get(url, headers=headers, timeout=12, allow_redirects=True, verify=False)
+            response = self.http.fetch_html(url, headers=headers, timeout=12, allow_redirects=True, verify=False, max_bytes=self.max_page_bytes)
             
-            if response.status_code != 200:
-                return None
+            if response is None or response.status_code != 200:
+                return False, None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            page_text = soup.get_text()
+            # Extract contact info (links, schema.org data and footer first,
+            # the full page text only if those come up empty) and the top 2
+            # same-site contact page candidates, /contact paths first. A page
+            # with no contact signal in its raw bytes is only used for links.
+            result = self.extract_page(response.content, response.url or url, link_limit=2)
+            emails, phones = result['emails'], result['phones']
             
-            # Extract contact info
-            emails = self.extract_emails_from_text(page_text)
-            phones = self.extract_phones_from_text(page_text)
-            
-            # Look for contact page links
-            contact_keywords = ['contact', 'about', 'reach', 'connect', 'info', 'support']
-            contact_links = []
-            
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '').lower()
-                text = link.get_text().lower()
+            # Contact pages are only needed while an email or a phone is still missing
+            if not (emails and phones):
+                # Fetched side by side
+                contact_links = result['contact_links']
                 
-                if any(keyword in href or keyword in text for keyword in contact_keywords):
-                    full_url = urljoin(url, link.get('href'))
-                    if full_url not in contact_links and full_url != url:
-                        contact_links.append(full_url)
-            
-            # Scrape contact pages
-            for contact_url in contact_links[:2]:  # Limit to top 2
-                try:
-                    time.sleep(1)
-                    contact_response = requests.get(contact_url, headers=headers, timeout=10, verify=False)
-                    
-                    if contact_response.status_code == 200:
-                        contact_soup = BeautifulSoup(contact_response.content, 'html.parser')
-                        contact_text = contact_soup.get_text()
+                if contact_links:
+                    page_pool = ThreadPoolExecutor(max_workers=len(contact_links))
+                    try:
+                        futures = [
+                            page_pool.submit(self.http.fetch_html, contact_url, headers=headers, timeout=10, verify=False, max_bytes=self.max_page_bytes)
+                            for contact_url in contact_links
+                        ]
                         
-                        emails.extend(self.extract_emails_from_text(contact_text))
-                        phones.extend(self.extract_phones_from_text(contact_text))
-                
-                except Exception:
-                    continue
+                        for future in as_completed(futures):
+                            try:
+                                contact_response = future.result()
+                                
+                                # Contact pages without any contact signal aren't parsed at all
+                                if contact_response is not None and contact_response.status_code == 200:
+                                    contact_result = self.extract_page(contact_response.content, contact_response.url)
+                                    emails.extend(contact_result['emails'])
+                                    phones.extend(contact_result['phones'])
+                            
+                            except Exception:
+                                continue
+                            
+                            # Stop once both are found
+                            if emails and phones:
+                                break
+                    finally:
+                        # Don't wait for slower pages once done: fetches already
+                        # in flight finish in the background and are ignored
+                        page_pool.shutdown(wait=False, cancel_futures=True)
             
             # Remove duplicates
             emails = list(set(emails))
             phones = list(set(phones))
             
             if emails or phones:
-                return {
+                return True, {
                     'company_name': company_name,
                     'website': url,
                     'emails': emails,
@@ -416,11 +409,11 @@ class ProfessionalSupplierScraper:
                     'source': 'Website Deep Scrape'
                 }
             
-            return None
+            return True, None
             
         except Exception as e:
             logger.debug(f"Error scraping website {url}: {e}")
-            return None
+            return False, None
 
     def process_search_results(self, search_results, commodity):
         """Process and enhance search results"""
@@ -483,45 +476,62 @@ class ProfessionalSupplierScraper:
     def process_commodity(self, commodity):
         """Process a single commodity with all sources"""
         self.current_commodity = commodity
+        self.publish_progress()
         logger.info(f"Processing {commodity}")
         
         all_data = []
+        prefilter_before = self.prefilter.get_stats()
         
         # Get search terms
         search_terms = self.get_search_terms_for_commodity(commodity)
         
-        # Method 1: DuckDuckGo Search
-        for search_term in search_terms:
+        # DuckDuckGo and ThomasNet are different hosts, so they run side by side;
+        # the politeness scheduler spaces repeat requests to each of them
+        with ThreadPoolExecutor(max_workers=2) as search_pool:
+            # Method 2: ThomasNet Directory
+            thomasnet_future = search_pool.submit(self.scrape_thomasnet_directory, commodity)
+            
+            # Method 1: DuckDuckGo Search
+            for search_term in search_terms:
+                try:
+                    duckduckgo_results = self.scrape_duckduckgo_search(search_term, max_results=10)
+                    all_data.extend(duckduckgo_results)
+                except Exception as e:
+                    logger.warning(f"DuckDuckGo search failed for {search_term}: {e}")
+            
             try:
-                duckduckgo_results = self.scrape_duckduckgo_search(search_term, max_results=10)
-                all_data.extend(duckduckgo_results)
-                time.sleep(random.uniform(3, 6))
+                all_data.extend(thomasnet_future.result())
             except Exception as e:
-                logger.warning(f"DuckDuckGo search failed for {search_term}: {e}")
-        
-        # Method 2: ThomasNet Directory
-        try:
-            thomasnet_results = self.scrape_thomasnet_directory(commodity)
-            all_data.extend(thomasnet_results)
-            time.sleep(random.uniform(4, 7))
-        except Exception as e:
-            logger.warning(f"ThomasNet search failed: {e}")
+                logger.warning(f"ThomasNet search failed: {e}")
         
         # Process results
         processed_data = self.process_search_results(all_data, commodity)
         
         # Method 3: Deep website scraping
-        websites_to_scrape = [
-            item.get('website') for item in processed_data 
-            if item.get('website') and item.get('website').startswith('http')
-        ][:6]  # Limit to 6 websites per commodity
+        # Same site from several results/search terms is fetched only once
+        websites_to_scrape, duplicates = dedupe_urls(
+            (item.get('website') for item in processed_data),
+            limit=6  # Limit to 6 websites per commodity
+        )
+        self.fetches_avoided += duplicates
         
         if websites_to_scrape:
             logger.info(f"Deep scraping {len(websites_to_scrape)} websites...")
             
             for website in websites_to_scrape:
                 try:
-                    contact_info = self.scrape_website_contact_info(website, f"Contact from {website}")
+                    # Sites already deep-scraped for an earlier commodity come from the memo
+                    if self.contact_memo.get(website) is None:
+                        fetched, contact_info = self._scrape_contacts(website, f"Contact from {website}")
+                        # A site that failed to load isn't memoized, so a later commodity retries it
+                        if fetched:
+                            self.contact_memo.put(
+                                website,
+                                contact_info['emails'] if contact_info else [],
+                                contact_info['phones'] if contact_info else []
+                            )
+                    else:
+                        contact_info = self.contact_memo.contact_info(website)
                     
                     if contact_info and (contact_info['emails'] or contact_info['phones']):
                         # Add deep scraping results
@@ -539,15 +549,17 @@ class ProfessionalSupplierScraper:
                             }
                             processed_data.append(deep_result)
                     
-                    time.sleep(random.uniform(2, 4))
-                    
                 except Exception as e:
                     logger.debug(f"Website scraping failed for {website}: {e}")
                     continue
         
         # Save to database
-        for record in processed_data:
-            self.save_to_db(record)
+        self.save_to_db(processed_data)
+        
+        prefilter_after = self.prefilter.get_stats()
+        skipped = prefilter_after['skipped'] - prefilter_before['skipped']
+        if skipped:
+            logger.info(f"Prefilter: {skipped}/{prefilter_after['pages'] - prefilter_before['pages']} pages had no contact signals")
         
         logger.info(f"Completed {commodity}: {len(processed_data)} records")
         return processed_data
@@ -556,8 +568,11 @@ class ProfessionalSupplierScraper:
         """Run the complete scraping process"""
         self.is_running = True
         self.collected_data = []
+        self.quality_total = 0
+        self.fetches_avoided = 0
         self.total_commodities = len(selected_commodities)
         self.progress = 0
+        self.publish_progress()
         
         logger.info(f"Starting scraping for {len(selected_commodities)} commodities")
         logger.info("Sources: DuckDuckGo + ThomasNet + Deep Website Scraping")
@@ -573,9 +588,11 @@ class ProfessionalSupplierScraper:
                 
                 commodity_results = self.process_commodity(commodity)
                 self.collected_data.extend(commodity_results)
+                self.quality_total += sum(item.get('quality_score', 0) for item in commodity_results)
                 
                 # Update progress
                 self.progress = (i / self.total_commodities) * 100
+                self.publish_commodity(commodity, commodity_results)
                 
                 # Time estimation
                 elapsed_time = time.time() - start_time
@@ -583,56 +600,90 @@ class ProfessionalSupplierScraper:
                 remaining_time = avg_time_per_commodity * (self.total_commodities - i)
                 
                 logger.info(f"Progress: {i}/{self.total_commodities} ({self.progress:.1f}%) - ETA: {remaining_time/60:.1f} min")
-                
-                # Rest between commodities
-                if i < len(selected_commodities):
-                    delay = random.uniform(8, 15)
-                    time.sleep(delay)
                     
             except Exception as e:
                 logger.error(f"Error processing {commodity}: {e}")
                 continue
         
         total_time = time.time() - start_time
+        self.flush_db()
         self.is_running = False
         self.status_message = f"Completed! Collected {len(self.collected_data)} records in {total_time/60:.1f} minutes"
+        self.publish_progress()
         logger.info(f"Scraping completed. Total records: {len(self.collected_data)}")
+        self.contact_memo.save()
+        
+        if self.db_writer is not None:
+            writer_stats = self.db_writer.get_stats()
+            logger.info(f"DB writer: {writer_stats['records']} records in {writer_stats['batches']} batches (avg {writer_stats['avg_flush_ms']} ms, max {writer_stats['max_flush_ms']} ms), max queue depth {writer_stats['max_depth']}, scraping blocked {writer_stats['put_wait']}s")
+        
+        politeness_stats = self.http.scheduler.get_stats()
+        logger.info(f"Politeness: {politeness_stats['delayed']}/{politeness_stats['requests']} requests waited {politeness_stats['total_wait']}s across {politeness_stats['hosts']} hosts")
+        pool_stats = self.http.get_stats()
+        logger.info(f"HTTP pool: {pool_stats['total_requests']} requests over {pool_stats['connections_opened']} connections (reuse rate {pool_stats['connection_reuse_rate']:.0%})")
+        search_stats = self.search_cache.get_stats()
+        logger.info(f"Search cache: {search_stats['hits']} hits, {search_stats['misses']} misses ({search_stats['hit_rate']:.0%} hit rate)")
+        logger.info(f"URL dedup: {self.fetches_avoided} duplicate deep-scrape fetches avoided")
+        prefilter_stats = self.prefilter.get_stats()
+        logger.info(f"Prefilter: {prefilter_stats['skipped']}/{prefilter_stats['pages']} pages skipped extraction ({prefilter_stats['bytes_skipped'] / 1024 / 1024:.1f} MB)")
+        event_stats = self.events.get_stats()
+        logger.info(f"Progress events: {event_stats['published']} published, {event_stats['delivered']} delivered to {event_stats['streams']} streams ({event_stats['resyncs']} resyncs)")
+        if self.parse_pool is not None:
+            parse_stats = self.parse_pool.get_stats()
+            logger.info(f"Parse pool: {parse_stats['tasks']} pages parsed by {parse_stats['workers']} worker processes ({parse_stats['failed']} fell back in-process)")
+        memo_stats = self.contact_memo.get_stats()
+        logger.info(f"Contact memo: {memo_stats['hits']} sites reused, {memo_stats['misses']} deep-scraped ({memo_stats['domains']} sites known)")
+        downloads = pool_stats['downloads']
+        logger.info(f"Downloads: {downloads['bytes_read'] / 1024 / 1024:.1f} MB read, {downloads['bytes_saved'] / 1024 / 1024:.1f} MB saved ({downloads['truncated']} pages truncated, {downloads['non_html_skipped']} non-HTML skipped)")
+        cache_stats = self.http.cache.get_stats()
+        logger.info(f"HTTP cache: {cache_stats['hits']} fresh hits, {cache_stats['revalidated']} revalidated, {cache_stats['misses']} misses ({cache_stats['local_rate']:.0%} served locally)")
 
     def get_progress_data(self):
         """Get current progress data"""
-        avg_quality = 0
-        if self.collected_data:
-            quality_scores = [item.get('quality_score', 0) for item in self.collected_data]
-            avg_quality = sum(quality_scores) / len(quality_scores)
+        total_records = len(self.collected_data)
+        avg_quality = self.quality_total / total_records if total_records else 0
         
         return {
             'is_running': self.is_running,
             'progress': round(self.progress, 1),
-            'total_records': len(self.collected_data),
+            'total_records': total_records,
             'current_commodity': self.current_commodity,
             'status_message': self.status_message,
             'avg_quality': round(avg_quality, 1)
         }
 
+    def publish_progress(self):
+        """Push the current progress to open dashboard streams"""
+        self.events.publish('progress', self.get_progress_data())
+
+    def publish_commodity(self, commodity, records):
+        """Push a finished commodity, its new records (table fields only) and the updated progress"""
+        if records:
+            self.events.publish('records', [{field: item.get(field) for field in RESULT_TABLE_FIELDS} for item in records])
+        self.events.publish('commodity', {'commodity': commodity, 'records': len(records)})
+        self.publish_progress()
+
     def stop_scraping(self):
         """Stop the scraping process"""
         self.is_running = False
         self.status_message = "Scraping stopped by user"
+        self.publish_progress()
+        self.flush_db()
 
     def clear_data(self):
         """Clear all collected data"""
         self.collected_data = []
+        self.quality_total = 0
         self.progress = 0
         self.current_commodity = ""
         self.status_message = "Data cleared - ready to start"
+        self.publish_progress()
         
         # Clear database
         try:
-            conn = sqlite3.connect('suppliers.db', check_same_thread=False)
-            c = conn.cursor()
-            c.execute('DELETE FROM suppliers')
-            conn.commit()
-            conn.close()
+            # Queued records would otherwise land after the DELETE
+            self.flush_db()
+            self.db.clear()
             logger.info("Database cleared")
         except Exception as e:
             logger.error(f"Error clearing database: {e}")
@@ -690,7 +741,7 @@ class ProfessionalSupplierScraper:
         return excel_buffer
 
 # Initialize scraper
-scraper = ProfessionalSupplierScraper()
+scraper = ProfessionalSupplierScraper(parse_workers=int(os.environ.get('PARSE_WORKERS', 0)))
 
 # Professional HTML Template
 HTML_TEMPLATE = '''<!DOCTYPE html>
@@ -1261,6 +1312,13 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
     <script>
         let isRunning = false;
         let statusInterval = null;
+        let progressSource = null;
+        const RESULT_FIELDS = '{{ result_fields }}';
+        const RESULTS_PAGE_SIZE = 50;
+        let resultsCursor = null;  // next_cursor of the last page loaded from /get_results
+        let shownResults = 0;
+        let liveStats = null;  // Counters over the records pushed during the current run
+        let liveRows = [];
 
         function updateSelectedCount() {
             const checkboxes = document.querySelectorAll('#commodityGrid input[type="checkbox"]');
@@ -1378,7 +1436,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             .then(data => {
                 showSuccess('Collection process stopped successfully!');
                 isRunning = false;
-                clearInterval(statusInterval);
+                stopStatusUpdates();
                 resetButtons();
             })
             .catch(error => {
@@ -1413,29 +1471,82 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         }
 
         function startStatusUpdates() {
+            liveStats = { total_records: 0, with_email: 0, with_phone: 0, quality_sum: 0, avg_quality: 0 };
+            liveRows = [];
+            if (!window.EventSource) {
+                startPolling();
+                return;
+            }
+            
+            // The server pushes changes as they happen, so an open tab costs
+            // one idle connection instead of a request every few seconds
+            progressSource = new EventSource('/stream_progress');
+            progressSource.addEventListener('progress', event => handleProgress(JSON.parse(event.data)));
+            progressSource.addEventListener('records', event => {
+                const records = JSON.parse(event.data);
+                records.forEach(record => {
+                    liveStats.total_records++;
+                    if (record.email) liveStats.with_email++;
+                    if (record.phone) liveStats.with_phone++;
+                    liveStats.quality_sum += record.quality_score || 0;
+                });
+                liveStats.avg_quality = liveStats.quality_sum / liveStats.total_records;
+                // Only the first page is kept while collecting; the full table
+                // pages in from the database once the run finishes
+                liveRows = liveRows.concat(records).slice(0, RESULTS_PAGE_SIZE);
+                displayResults(liveRows, liveStats, null);
+                document.getElementById('resultsCard').style.display = 'block';
+            });
+            progressSource.addEventListener('commodity', event => {
+                const data = JSON.parse(event.data);
+                console.log(`Finished ${data.commodity}: ${data.records} records`);
+            });
+            // Events were dropped while this tab lagged behind: reload the table
+            progressSource.addEventListener('resync', () => loadResults());
+            progressSource.onerror = () => {
+                // EventSource retries on its own; only a closed source needs the fallback
+                if (progressSource && progressSource.readyState === EventSource.CLOSED) {
+                    progressSource = null;
+                    if (isRunning) startPolling();
+                }
+            };
+        }
+
+        function startPolling() {
             statusInterval = setInterval(() => {
                 fetch('/get_progress')
                 .then(response => response.json())
-                .then(data => {
-                    updateStatus(data);
-                    
-                    if (!data.is_running && isRunning) {
-                        isRunning = false;
-                        clearInterval(statusInterval);
-                        resetButtons();
-                        showSuccess(`Collection completed successfully! Collected ${data.total_records} records.`);
-                        if (data.total_records > 0) {
-                            document.getElementById('exportBtn').disabled = false;
-                            loadResults();
-                        }
-                    }
-                })
+                .then(handleProgress)
                 .catch(error => {
                     console.error('Status update error:', error);
                 });
             }, 3000);
         }
 
+        function stopStatusUpdates() {
+            clearInterval(statusInterval);
+            statusInterval = null;
+            if (progressSource) {
+                progressSource.close();
+                progressSource = null;
+            }
+        }
+
+        function handleProgress(data) {
+            updateStatus(data);
+            
+            if (!data.is_running && isRunning) {
+                isRunning = false;
+                stopStatusUpdates();
+                resetButtons();
+                showSuccess(`Collection completed successfully! Collected ${data.total_records} records.`);
+                if (data.total_records > 0) {
+                    document.getElementById('exportBtn').disabled = false;
+                    loadResults();
+                }
+            }
+        }
+
         function updateStatus(data) {
             document.getElementById('totalRecords').textContent = (data.total_records || 0).toLocaleString();
             document.getElementById('progressPercent').textContent = Math.round(data.progress || 0) + '%';
@@ -1467,11 +1578,14 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         }
 
         function loadResults() {
-            fetch('/get_results')
-            .then(response => response.json())
-            .then(data => {
-                if (data.success && data.results.length > 0) {
-                    displayResults(data.results);
+            resultsCursor = null;
+            Promise.all([
+                fetch('/api/stats').then(response => response.json()),
+                fetchResultsPage()
+            ])
+            .then(([stats, page]) => {
+                if (page.success && page.results.length > 0) {
+                    displayResults(page.results, stats, page.next_cursor);
                     document.getElementById('resultsCard').style.display = 'block';
                 }
             })
@@ -1480,14 +1594,37 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             });
         }
 
-        function displayResults(results) {
+        function fetchResultsPage() {
+            const params = new URLSearchParams({ limit: RESULTS_PAGE_SIZE, fields: RESULT_FIELDS });
+            if (resultsCursor) params.set('cursor', resultsCursor);
+            return fetch('/get_results?' + params).then(response => response.json());
+        }
+
+        function loadMoreResults() {
+            document.getElementById('loadMoreBtn').disabled = true;
+            fetchResultsPage()
+            .then(page => {
+                if (!page.success) throw new Error(page.error);
+                document.getElementById('resultsBody').insertAdjacentHTML('beforeend', page.results.map(resultRow).join(''));
+                shownResults += page.results.length;
+                resultsCursor = page.next_cursor;
+                updateResultsFooter(page.total);
+            })
+            .catch(error => {
+                showAlert('Error loading results: ' + error.message);
+                document.getElementById('loadMoreBtn').disabled = false;
+            });
+        }
+
+        function displayResults(results, stats, nextCursor) {
             const container = document.getElementById('resultsContainer');
+            resultsCursor = nextCursor;
+            shownResults = results.length;
             
-            // Calculate statistics
-            const totalRecords = results.length;
-            const withEmail = results.filter(r => r.email).length;
-            const withPhone = results.filter(r => r.phone).length;
-            const highQuality = results.filter(r => r.quality_score >= 70).length;
+            // Totals come from the server (or the live counters), not from the rows on screen
+            const totalRecords = stats.total_records;
+            const withEmail = stats.with_email;
+            const withPhone = stats.with_phone;
             
             let html = `
                 <div class="features-grid" style="margin-bottom: 25px;">
@@ -1507,9 +1644,9 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                         <p>${((withPhone/totalRecords)*100).toFixed(1)}% with phones</p>
                     </div>
                     <div class="feature-item">
-                        <div class="feature-icon">${highQuality}</div>
-                        <h4>High Quality</h4>
-                        <p>${((highQuality/totalRecords)*100).toFixed(1)}% premium leads</p>
+                        <div class="feature-icon">${Math.round(stats.avg_quality || 0)}</div>
+                        <h4>Average Quality</h4>
+                        <p>Data quality score</p>
                     </div>
                 </div>
                 
@@ -1525,44 +1662,58 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                             <th><i class="fas fa-source"></i> Source</th>
                         </tr>
                     </thead>
-                    <tbody>
+                    <tbody id="resultsBody">${results.map(resultRow).join('')}</tbody>
+                </table>
+                <div id="resultsFooter"></div>
             `;
             
-            // Show first 15 results
-            results.slice(0, 15).forEach(result => {
-                const qualityColor = result.quality_score >= 70 ? '#2ed573' : 
-                                   result.quality_score >= 50 ? '#ffa502' : '#ff4757';
-                
-                html += `
-                    <tr>
-                        <td><strong>${result.company_name || '-'}</strong></td>
-                        <td>${result.email ? `<a href="mailto:${result.email}" style="color: #4ecdc4;">${result.email}</a>` : '-'}</td>
-                        <td>${result.phone ? `<a href="tel:${result.phone}" style="color: #4ecdc4;">${result.phone}</a>` : '-'}</td>
-                        <td>${result.website ? `<a href="${result.website}" target="_blank" style="color: #4ecdc4;"><i class="fas fa-external-link-alt"></i></a>` : '-'}</td>
-                        <td><span style="background: rgba(78,205,196,0.2); padding: 2px 8px; border-radius: 12px; font-size: 0.8rem;">${result.commodity || '-'}</span></td>
-                        <td><span style="color: ${qualityColor}; font-weight: bold;">${result.quality_score || 0}</span></td>
-                        <td><span style="font-size: 0.8rem; opacity: 0.8;">${result.source || '-'}</span></td>
-                    </tr>
-                `;
-            });
-            
-            html += '</tbody></table>';
+            container.innerHTML = html;
+            updateResultsFooter(totalRecords);
+        }
+
+        function resultRow(result) {
+            const qualityColor = result.quality_score >= 70 ? '#2ed573' : 
+                               result.quality_score >= 50 ? '#ffa502' : '#ff4757';
             
-            if (results.length > 15) {
-                html += `
-                    <div style="margin-top: 20px; text-align: center; padding: 15px; background: rgba(78,205,196,0.1); border-radius: 12px;">
-                        <i class="fas fa-info-circle"></i> 
-                        <strong>Showing first 15 of ${results.length.toLocaleString()} records.</strong><br>
-                        <small>Export to Excel for complete data with advanced filtering and analysis.</small>
-                    </div>
-                `;
+            return `
+                <tr>
+                    <td><strong>${result.company_name || '-'}</strong></td>
+                    <td>${result.email ? `<a href="mailto:${result.email}" style="color: #4ecdc4;">${result.email}</a>` : '-'}</td>
+                    <td>${result.phone ? `<a href="tel:${result.phone}" style="color: #4ecdc4;">${result.phone}</a>` : '-'}</td>
+                    <td>${result.website ? `<a href="${result.website}" target="_blank" style="color: #4ecdc4;"><i class="fas fa-external-link-alt"></i></a>` : '-'}</td>
+                    <td><span style="background: rgba(78,205,196,0.2); padding: 2px 8px; border-radius: 12px; font-size: 0.8rem;">${result.commodity || '-'}</span></td>
+                    <td><span style="color: ${qualityColor}; font-weight: bold;">${result.quality_score || 0}</span></td>
+                    <td><span style="font-size: 0.8rem; opacity: 0.8;">${result.source || '-'}</span></td>
+                </tr>
+            `;
+        }
+
+        function updateResultsFooter(total) {
+            const footer = document.getElementById('resultsFooter');
+            if (!resultsCursor && shownResults >= total) {
+                footer.innerHTML = '';
+                return;
             }
             
-            container.innerHTML = html;
+            // A cursor means the database has more pages; without one these are live rows of a running collection
+            const more = resultsCursor ?
+                `<button class="btn btn-secondary" id="loadMoreBtn" onclick="loadMoreResults()" style="margin-top: 12px;">
+                    <i class="fas fa-chevron-down"></i> Load ${RESULTS_PAGE_SIZE} more
+                </button>` :
+                '<small>The full table loads when the collection finishes.</small>';
+            footer.innerHTML = `
+                <div style="margin-top: 20px; text-align: center; padding: 15px; background: rgba(78,205,196,0.1); border-radius: 12px;">
+                    <i class="fas fa-info-circle"></i> 
+                    <strong>Showing ${shownResults.toLocaleString()} of ${(total || shownResults).toLocaleString()} records.</strong><br>
+                    <small>Export to Excel for complete data with advanced filtering and analysis.</small><br>
+                    ${more}
+                </div>
+            `;
         }
 
         // Initialize page
         updateSelectedCount();
+        loadResults();  // Results stored by earlier runs
         
         // Add keyboard shortcuts
         document.addEventListener('keydown', function(e) {
@@ -1622,7 +1773,8 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 @app.route('/')
 def index():
     """Main dashboard page"""
-    return render_template_string(HTML_TEMPLATE, commodities=scraper.all_commodities)
+    return render_template_string(HTML_TEMPLATE, commodities=scraper.all_commodities,
+                                  result_fields=','.join(RESULT_TABLE_FIELDS))
 
 @app.route('/start_scraping', methods=['POST'])
 def start_scraping():
@@ -1644,6 +1796,7 @@ def start_scraping():
             except Exception as e:
                 logger.error(f"Scraping thread error: {e}")
                 scraper.is_running = False
+                scraper.publish_progress()
         
         scraper.thread = threading.Thread(target=run_scraping, daemon=True)
         scraper.thread.start()
@@ -1683,15 +1836,43 @@ def get_progress():
         logger.error(f"Error getting progress: {e}")
         return jsonify({'error': str(e), 'is_running': False, 'progress': 0, 'total_records': 0})
 
+@app.route('/stream_progress')
+def stream_progress():
+    """Server-Sent Events stream of progress, finished commodities and new records"""
+    if scraper.events.is_full():
+        # Each stream holds a worker thread; past the cap the dashboard falls back to polling
+        return jsonify({'error': 'Too many open progress streams'}), 503
+    response = Response(stream_with_context(scraper.events.stream(scraper.get_progress_data)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let nginx hold events back
+    return response
+
 @app.route('/get_results')
 def get_results():
-    """Get collected results"""
+    """Get a page of stored results.
+
+    Query parameters: limit (default 50, max 500), cursor (next_cursor of the
+    previous page), commodity, source, min_quality, has_email=1 and fields
+    (comma-separated). Served from suppliers.db, best quality first.
+    """
+    if scraper.db is None:
+        return jsonify({'success': False, 'error': 'Database unavailable'}), 503
     try:
-        return jsonify({
-            'success': True,
-            'results': scraper.collected_data,
-            'total': len(scraper.collected_data)
-        })
+        args = request.args
+        fields = [field.strip() for field in args.get('fields', '').split(',') if field.strip()]
+        page = scraper.db.page(
+            limit=min(max(args.get('limit', 50, type=int), 1), MAX_RESULTS_PAGE),
+            cursor=args.get('cursor') or None,
+            commodity=args.get('commodity') or None,
+            source=args.get('source') or None,
+            min_quality=args.get('min_quality', type=int),
+            has_email=args.get('has_email', '').lower() in ('1', 'true', 'yes'),
+            fields=fields
+        )
+        return jsonify({'success': True, **page})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting results: {e}")
         return jsonify({'success': False, 'error': str(e)})
@@ -1730,35 +1911,11 @@ def health_check():
 def get_stats():
     """Get database statistics API"""
     try:
-        conn = sqlite3.connect('suppliers.db', check_same_thread=False)
-        c = conn.cursor()
-        
-        # Get basic stats
-        c.execute('SELECT COUNT(*) FROM suppliers')
-        total_records = c.fetchone()[0]
-        
-        c.execute('SELECT COUNT(*) FROM suppliers WHERE email IS NOT NULL AND email != ""')
-        with_email = c.fetchone()[0]
-        
-        c.execute('SELECT COUNT(*) FROM suppliers WHERE phone IS NOT NULL AND phone != ""')
-        with_phone = c.fetchone()[0]
-        
-        c.execute('SELECT AVG(quality_score) FROM suppliers')
-        avg_quality = c.fetchone()[0] or 0
-        
-        # Top commodities
-        c.execute('SELECT commodity, COUNT(*) as count FROM suppliers GROUP BY commodity ORDER BY count DESC LIMIT 10')
-        top_commodities = c.fetchall()
-        
-        conn.close()
-        
-        return jsonify({
-            'total_records': total_records,
-            'with_email': with_email,
-            'with_phone': with_phone,
-            'avg_quality': round(avg_quality, 2),
-            'top_commodities': [{'commodity': row[0], 'count': row[1]} for row in top_commodities]
-        })
+        # Precomputed totals on the read connection: no table scans, and no
+        # waiting for the scraper thread's writes
+        stats = scraper.db.summary()
+        stats['writer'] = scraper.db_writer.get_stats() if scraper.db_writer else None
+        return jsonify(stats)
         
     except Exception as e:
         logger.error(f"Stats error: {e}")
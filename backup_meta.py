@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+from datetime import datetime
+
+from json_stream import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+
+def meta_path(path):
+    return f"{path}.meta.json"
+
+
+def read_meta(path):
+    """Sidecar metadata of `path`, or None when missing or written for a different version of the file"""
+    try:
+        with open(meta_path(path), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if meta.get('size') != stat.st_size or meta.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    return meta
+
+
+def write_meta(path, commodities):
+    """Record the per-commodity record counts of `path` next to it.
+
+    Size and mtime of the data file are stored too, so a sidecar left
+    behind by an older copy of the file is ignored rather than trusted.
+    """
+    stat = os.stat(path)
+    meta = {
+        'count': sum(commodities.values()),
+        'commodities': commodities,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'updated': datetime.now().isoformat()
+    }
+    try:
+        tmp_path = f"{meta_path(path)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path(path))
+    except OSError as e:
+        logger.debug(f"Could not write metadata for {path}: {e}")
+    return meta
+
+
+def iter_backup_records(path, commodities=None):
+    """Stream the records of a JSON backup ({"data": [...]}), optionally only those of `commodities`"""
+    for record in iter_json_array(path, 'data'):
+        if commodities is None or record.get('commodity') in commodities:
+            yield record
+
+
+def backup_meta(path):
+    """Record counts of a JSON backup: from the sidecar, or one streaming pass that writes it"""
+    meta = read_meta(path)
+    if meta is None:
+        counts = {}
+        for record in iter_json_array(path, 'data'):
+            commodity = record.get('commodity')
+            counts[commodity] = counts.get(commodity, 0) + 1
+        meta = write_meta(path, counts)
+    return meta
@@ -0,0 +1,92 @@
+"""Checkpoint cost of full rewrites vs the append-only checkpoint log.
+
+Simulates a collection run with the records of the committed
+supplier_data_backup.json: every commodity adds its records and every 5th
+commodity checkpoints. The old scheme rewrites the whole JSON backup
+(indent=2) and a new checkpoint CSV each time; the log appends each
+commodity and fsyncs at the checkpoint. Reports time and bytes written per
+checkpoint as the run grows, then the time to replay the log.
+
+Usage:
+    python benchmarks/bench_checkpoint_log.py --commodities 100 --records 40
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from checkpoint_log import CheckpointLog
+
+
+def load_records():
+    with open(os.path.join(ROOT, 'supplier_data_backup.json'), encoding='utf-8') as f:
+        return json.load(f)['data']
+
+
+def full_rewrite(directory, collected, checkpoint):
+    """What every checkpoint used to do"""
+    backup = os.path.join(directory, 'supplier_data_backup.json')
+    with open(backup, 'w', encoding='utf-8') as f:
+        json.dump({'data': collected, 'count': len(collected), 'backup_time': datetime.now().isoformat()},
+                  f, ensure_ascii=False, indent=2)
+    csv_path = os.path.join(directory, f'checkpoint_data_{checkpoint}.csv')
+    pd.DataFrame(collected).to_csv(csv_path, index=False, encoding='utf-8')
+    return os.path.getsize(backup) + os.path.getsize(csv_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commodities', type=int, default=100)
+    parser.add_argument('--records', type=int, default=40, help='Records per commodity')
+    parser.add_argument('--interval', type=int, default=5, help='Commodities per checkpoint')
+    args = parser.parse_args()
+
+    source = load_records()
+    batches = [[dict(source[(c * args.records + i) % len(source)], commodity=f'Commodity {c}')
+                for i in range(args.records)] for c in range(args.commodities)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = CheckpointLog(os.path.join(tmp, 'supplier_data_log.jsonl'))
+        collected = []
+        rows = []
+        old_total = new_total = 0.0
+        old_bytes = 0
+        for c, batch in enumerate(batches, 1):
+            collected.extend(batch)
+
+            start = time.perf_counter()
+            log.append_commodity(f'Commodity {c - 1}', batch)
+            if c % args.interval == 0:
+                log.sync()
+            new_total += time.perf_counter() - start
+
+            if c % args.interval == 0:
+                start = time.perf_counter()
+                old_bytes += full_rewrite(tmp, collected, c)
+                old_time = time.perf_counter() - start
+                old_total += old_time
+                rows.append((c, len(collected), old_time))
+
+        for c, records, old_time in rows[::max(1, len(rows) // 5)] + rows[-1:]:
+            print(f"  checkpoint after {c:>3} commodities ({records:>5} records): full rewrite {old_time * 1000:8.1f} ms")
+
+        print(f"\nWhole run: full rewrites {old_total:.2f}s, {old_bytes / 1024 / 1024:.1f} MB written; "
+              f"log {new_total:.2f}s, {log.get_stats()['bytes'] / 1024 / 1024:.1f} MB written ({log.get_stats()['syncs']} fsyncs)")
+
+        start = time.perf_counter()
+        records, completed = CheckpointLog(log.path).replay()
+        print(f"Replay: {len(records)} records, {len(completed)} commodities in {time.perf_counter() - start:.2f}s, "
+              f"same records: {records == json.loads(json.dumps(collected, default=str))}")
+        log.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Compare the shared ContactExtractor with the original per-scraper extraction.
+
+Runs both over the snippet column of the committed checkpoint/export CSVs
+(one text per row, and again as page-sized chunks), checks that every text
+yields the same emails and phones, and reports the time taken.
+
+Usage:
+    python benchmarks/bench_contact_extractor.py --repeat 5
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from contact_extractor import ContactExtractor, EMAIL_BLACKLIST, PHONE_PATTERNS
+
+
+def legacy_extract_emails(text, blacklist):
+    """The original extract_emails_from_text"""
+    if not text:
+        return []
+
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
+    emails = re.findall(email_pattern, text, re.IGNORECASE)
+
+    filtered_emails = []
+    for email in emails:
+        email_lower = email.lower()
+        if not any(skip in email_lower for skip in blacklist):
+            filtered_emails.append(email)
+
+    return list(set(filtered_emails))
+
+
+def legacy_extract_phones(text, phone_patterns):
+    """The original extract_phones_from_text"""
+    if not text:
+        return []
+
+    phones = []
+    for pattern in phone_patterns:
+        matches = re.findall(pattern, text)
+        phones.extend(matches)
+
+    cleaned_phones = []
+    for phone in phones:
+        cleaned = re.sub(r'[^\d+]', '', phone)
+        if len(cleaned) >= 10:
+            cleaned_phones.append(phone.strip())
+
+    return list(set(cleaned_phones))
+
+
+def load_snippets():
+    texts = []
+    paths = sorted(glob.glob(os.path.join(ROOT, 'checkpoint_data_*.csv')))
+    paths += sorted(glob.glob(os.path.join(ROOT, 'supplier_database_*.csv')))
+    for path in paths:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                for column in ('snippet', 'email', 'phone', 'additional_emails', 'additional_phones'):
+                    if row.get(column):
+                        texts.append(row[column])
+    return texts
+
+
+def chunk(texts, size):
+    """Join short texts into page-sized blocks"""
+    chunks, current, length = [], [], 0
+    for text in texts:
+        current.append(text)
+        length += len(text)
+        if length >= size:
+            chunks.append('\n'.join(current))
+            current, length = [], 0
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+def run(label, texts, variants, repeat):
+    print(f"\n{label}: {len(texts)} texts, {sum(len(t) for t in texts) / 1024:.0f} KB")
+    for name, blacklist, phone_patterns in variants:
+        extractor = ContactExtractor(blacklist=blacklist, phone_patterns=phone_patterns)
+
+        mismatches = 0
+        for text in texts:
+            if (set(extractor.extract_emails(text)) != set(legacy_extract_emails(text, blacklist)) or
+                    set(extractor.extract_phones(text)) != set(legacy_extract_phones(text, phone_patterns))):
+                mismatches += 1
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                legacy_extract_emails(text, blacklist)
+                legacy_extract_phones(text, phone_patterns)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                extractor.extract(text)
+        new_time = time.perf_counter() - start
+
+        print(f"  {name:<8} legacy {legacy_time:6.3f}s  shared {new_time:6.3f}s  "
+              f"({legacy_time / new_time:.1f}x faster)  mismatches: {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--chunk-kb', type=int, default=64, help='Size of the page-sized blocks')
+    args = parser.parse_args()
+
+    variants = [
+        ('scraper', EMAIL_BLACKLIST, PHONE_PATTERNS),
+        ('app', EMAIL_BLACKLIST + ('support@example',), PHONE_PATTERNS[:6]),
+    ]
+
+    snippets = load_snippets()
+    run('Snippets', snippets, variants, args.repeat)
+    run('Page-sized blocks', chunk(snippets, args.chunk_kb * 1024), variants, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
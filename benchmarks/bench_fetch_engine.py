@@ -0,0 +1,86 @@
+"""Compare serial vs async deep scraping against local stand-in supplier sites.
+
+Usage:
+    python benchmarks/bench_fetch_engine.py --sites 8 --latency 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import FixtureServer
+from supplier_scraper import EnhancedSupplierScraper
+
+
+def serial_deep_scrape(scraper, websites):
+    """Baseline: the original one-request-at-a-time fetch order (without sleeps)"""
+    results = []
+    for url in websites:
+        response = requests.get(url, headers=scraper.get_headers(), timeout=12)
+        soup = BeautifulSoup(response.content, 'html.parser')
+        emails = scraper.extract_emails_from_text(soup.get_text())
+        phones = scraper.extract_phones_from_text(soup.get_text())
+
+        contact_links = []
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '').lower()
+            text = link.get_text().lower()
+            if any(k in href or k in text for k in ['contact', 'about', 'reach', 'connect', 'info', 'support']):
+                full_url = urljoin(url, link.get('href'))
+                if full_url not in contact_links and full_url != url:
+                    contact_links.append(full_url)
+
+        for contact_url in contact_links[:3]:
+            contact_soup = BeautifulSoup(requests.get(contact_url, timeout=10).content, 'html.parser')
+            emails.extend(scraper.extract_emails_from_text(contact_soup.get_text()))
+            phones.extend(scraper.extract_phones_from_text(contact_soup.get_text()))
+
+        results.append((sorted(set(emails)), sorted(set(phones))))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sites', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.5)
+    args = parser.parse_args()
+
+    servers = [FixtureServer(latency=args.latency).start() for _ in range(args.sites)]
+    websites = [server.base_url for server in servers]
+    scraper = EnhancedSupplierScraper()
+
+    try:
+        start = time.perf_counter()
+        serial = serial_deep_scrape(scraper, websites)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        infos = scraper.deep_scrape_websites(websites)
+        async_time = time.perf_counter() - start
+
+        concurrent = [(sorted(info['emails']), sorted(info['phones'])) if info else ([], []) for info in infos]
+
+        print(f"Sites: {args.sites}, latency per request: {args.latency:.2f}s")
+        print(f"Serial deep scrape: {serial_time:6.2f}s")
+        print(f"Async deep scrape:  {async_time:6.2f}s  ({serial_time / async_time:.1f}x faster)")
+        # Ranked discovery stops once an email and a phone are found, and
+        # structured extraction reads tel:/mailto: links as written, so the
+        # async side should cover the same sites rather than match exactly
+        consistent = all(
+            bool(c_emails) == bool(s_emails) and bool(c_phones) == bool(s_phones)
+            for (s_emails, s_phones), (c_emails, c_phones) in zip(serial, concurrent)
+        )
+        print(f"Results identical: {serial == concurrent}, same email/phone coverage: {consistent}")
+    finally:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
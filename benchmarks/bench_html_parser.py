@@ -0,0 +1,88 @@
+"""Per-page parse time of each HTML parser backend.
+
+For every fixture page (plus a padded copy that approximates a real
+homepage) this times text + link extraction for each installed backend, and
+the BeautifulSoup tree the search-result parsers get from make_soup. It also
+checks that every backend finds the same emails, phones and links as the
+original html.parser soup, and compares full-text contact extraction with
+the structured path (mailto/tel links, schema.org, footer/address blocks).
+
+Usage:
+    python benchmarks/bench_html_parser.py --repeat 200
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_extractor import default_extractor
+from fixture_server import FIXTURES_DIR
+from html_parser import BACKENDS, available_backends, make_soup, parse_page
+
+
+def load_pages(pad_to_kb):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '**', '*.html'), recursive=True)):
+        with open(path, 'rb') as f:
+            pages[os.path.relpath(path, FIXTURES_DIR)] = f.read()
+
+    # Real homepages carry far more markup than the fixtures; repeat the main
+    # content of the index page (keeping one header/footer) to a typical size
+    index = pages.get('index.html')
+    if index and pad_to_kb:
+        head, _, rest = index.partition(b'<main>')
+        main, _, tail = rest.partition(b'</main>')
+        copies = max(1, pad_to_kb * 1024 // max(len(main), 1))
+        pages[f'index.html, main x{copies}'] = head + b'<main>' + main * copies + b'</main>' + tail
+    return pages
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def summary(page):
+    text = page.text()
+    return (
+        set(default_extractor.extract_emails(text)),
+        set(default_extractor.extract_phones(text)),
+        [href for href, _ in page.links()]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--pad-kb', type=int, default=100, help='Size of the padded homepage (0 to skip)')
+    args = parser.parse_args()
+
+    backends = available_backends()
+    missing = [b for b in BACKENDS if b not in backends]
+    print(f"Backends: {', '.join(backends)}" + (f" (not installed: {', '.join(missing)})" if missing else ''))
+
+    for name, content in load_pages(args.pad_kb).items():
+        print(f"\n{name} ({len(content) / 1024:.1f} KB), ms per page:")
+        reference = summary(parse_page(content, 'bs4'))
+
+        for backend in backends:
+            page_ms = timed(lambda: (lambda p: (p.text(), p.links()))(parse_page(content, backend)), args.repeat)
+            soup_ms = timed(lambda: make_soup(content, backend), args.repeat)
+            same = summary(parse_page(content, backend)) == reference
+            print(f"  {backend:<11} text+links {page_ms:7.2f}   search soup {soup_ms:7.2f}   same contacts/links: {same}")
+
+            full_ms = timed(lambda: default_extractor.extract(parse_page(content, backend).text()), args.repeat)
+            structured_ms = timed(lambda: default_extractor.extract_from_page(parse_page(content, backend)), args.repeat)
+            full = default_extractor.extract(parse_page(content, backend).text())
+            structured = default_extractor.extract_from_page(parse_page(content, backend))
+            print(f"  {'':<11} contacts: full text {full_ms:7.2f} ({len(full[0])} emails, {len(full[1])} phones)"
+                  f"   structured {structured_ms:7.2f} ({len(structured[0])} emails, {len(structured[1])} phones)")
+
+
+if __name__ == '__main__':
+    main()
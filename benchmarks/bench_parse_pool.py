@@ -0,0 +1,64 @@
+"""Parse/extract throughput in-process vs in the ParsePool worker processes.
+
+Feeds the padded fixture homepage (and the other fixture pages) through
+extract_page the way the deep scraper does: inline in one thread, then
+through ParsePool with 1..N workers fed by several fetcher threads. Checks
+that every mode returns the same results.
+
+Usage:
+    python benchmarks/bench_parse_pool.py --pages 400 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_html_parser import load_pages
+from parse_pool import ParsePool, extract_page
+
+
+def summarize(results):
+    return [(sorted(r['emails']), sorted(r['phones']), r['contact_links']) for r in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--fetchers', type=int, default=8, help='Threads handing pages to the pool')
+    parser.add_argument('--max-tasks-per-child', type=int, default=100)
+    parser.add_argument('--pad-kb', type=int, default=100)
+    args = parser.parse_args()
+
+    fixtures = list(load_pages(args.pad_kb).values())
+    pages = [fixtures[i % len(fixtures)] for i in range(args.pages)]
+    page_url = 'https://www.example.com/'
+    total_kb = sum(len(p) for p in pages) / 1024
+    print(f"{len(pages)} pages, {total_kb / 1024:.1f} MB, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    inline = [extract_page(page, page_url, link_limit=3) for page in pages]
+    inline_time = time.perf_counter() - start
+    print(f"  in-process      {inline_time:6.2f}s  {len(pages) / inline_time:7.1f} pages/s")
+
+    for workers in args.workers:
+        pool = ParsePool(max_workers=workers, max_tasks_per_child=args.max_tasks_per_child)
+        # Warm up so worker start-up isn't counted against the first pages
+        pool.extract(pages[0], page_url, 3)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.fetchers) as fetchers:
+            pooled = list(fetchers.map(lambda page: pool.extract(page, page_url, 3), pages))
+        pool_time = time.perf_counter() - start
+        stats = pool.get_stats()
+        pool.shutdown()
+
+        print(f"  pool x{workers:<2}        {pool_time:6.2f}s  {len(pages) / pool_time:7.1f} pages/s  "
+              f"({inline_time / pool_time:.1f}x, failed {stats['failed']}, same results: {summarize(pooled) == summarize(inline)})")
+
+
+if __name__ == '__main__':
+    main()
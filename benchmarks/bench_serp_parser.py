@@ -0,0 +1,115 @@
+"""Full-tree vs restricted parsing of the saved search result pages.
+
+For each SERP fixture (padded with inline script to the size of a real
+results page) this times the original approach - a full BeautifulSoup tree
+and one find_all per container selector, concatenated - against
+result_soup + find_results, which only builds the result containers and
+selects them in one pass. Compares the (title, link) results each yields
+within the scrapers' max_results, and how many containers were selected
+(the old selectors return nested blocks of the same result again).
+
+Usage:
+    python benchmarks/bench_serp_parser.py --repeat 100
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from html_parser import (available_backends, find_results, is_duckduckgo_result, is_google_result,
+                         make_soup, result_soup)
+
+SERP_DIR = os.path.join(BENCH_DIR, 'fixtures', 'serp')
+
+
+def google_legacy(soup):
+    return (soup.find_all('div', class_='g') +
+            soup.find_all('div', {'data-sokoban-container': True}) +
+            soup.find_all('div', class_='Gx5Zad'))
+
+
+def google_title(container):
+    return (container.find('h3') or container.find('div', class_='BNeawe vvjwJb AP7Wnd') or
+            container.find('div', class_='r'))
+
+
+def duckduckgo_legacy(soup):
+    return soup.find_all('div', class_='result')
+
+
+def duckduckgo_title(container):
+    return container.find('a', class_='result__a')
+
+
+# name prefix: (original selection, container filter, title lookup, scraper's max_results)
+ENGINES = {
+    'google': (google_legacy, is_google_result, google_title, 20),
+    'duckduckgo': (duckduckgo_legacy, is_duckduckgo_result, duckduckgo_title, 15),
+}
+
+
+def load_serps(pad_to_kb):
+    serps = {}
+    for path in sorted(glob.glob(os.path.join(SERP_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            content = f.read()
+        # Real result pages are mostly inline script; repeat the page's first
+        # script block ahead of the results up to a typical size
+        if pad_to_kb:
+            start = content.find(b'<script')
+            script = content[start:content.find(b'</script>', start) + len(b'</script>')]
+            copies = max(0, (pad_to_kb * 1024 - len(content)) // max(len(script), 1))
+            content = content.replace(b'<body>', b'<body>\n' + script * copies, 1)
+        serps[os.path.basename(path)] = content
+    return serps
+
+
+def summarize(containers, find_title, max_results):
+    """(title, link) per container, deduplicated by link like the scrapers do"""
+    results, seen = [], set()
+    for container in containers[:max_results]:
+        title = find_title(container)
+        link = container.find('a', href=True)
+        if title and link and link['href'] not in seen:
+            seen.add(link['href'])
+            results.append((title.get_text(strip=True), link['href']))
+    return results
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--pad-kb', type=int, default=300, help='Size of the padded result pages (0 to skip)')
+    args = parser.parse_args()
+
+    backends = [b for b in available_backends() if b != 'selectolax']
+    for name, content in load_serps(args.pad_kb).items():
+        legacy_select, is_result, find_title, max_results = ENGINES[name.split('.')[0].split('_')[0]]
+        print(f"\n{name} ({len(content) / 1024:.1f} KB), ms per page:")
+
+        for backend in backends:
+            legacy_containers = legacy_select(make_soup(content, backend))
+            containers = find_results(result_soup(content, is_result, backend), is_result)
+
+            full_ms = timed(lambda: legacy_select(make_soup(content, backend)), args.repeat)
+            restricted_ms = timed(lambda: find_results(result_soup(content, is_result, backend), is_result), args.repeat)
+            legacy_results = summarize(legacy_containers, find_title, max_results)
+            results = summarize(containers, find_title, max_results)
+            print(f"  {backend:<6} full tree {full_ms:7.2f}   restricted {restricted_ms:7.2f}  "
+                  f"({full_ms / restricted_ms:.1f}x)   containers {len(legacy_containers)} -> {len(containers)}   "
+                  f"results {len(legacy_results)} -> {len(results)}, same order: {results[:len(legacy_results)] == legacy_results}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""/api/stats from full-table scans vs the trigger-maintained summary tables.
+
+Fills a scratch suppliers.db through SupplierDB (batched inserts, INSERT OR
+REPLACE of existing rows, updates and deletes), then times the five scan
+queries the endpoint used to run against SupplierDB.summary() and checks
+that both give the same numbers.
+
+Usage:
+    python benchmarks/bench_supplier_stats.py --rows 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supplier_db import SupplierDB
+
+COMMODITIES = ['Bearings', 'Cheese', 'Containers', 'Fastners', 'Rice', 'Seafood', 'Sheet Metal', 'Solar Panels',
+               'Spices', 'Textiles', 'Used Machinery', 'Water Treatment']
+
+
+def make_records(count, rng, offset=0):
+    return [{
+        'company_name': f'Company {offset + i}',
+        'email': f'info@company{offset + i}.com' if rng.random() < 0.6 else rng.choice([None, '']),
+        'phone': f'(555) 010-{i % 10000:04d}' if rng.random() < 0.4 else None,
+        'website': f'https://company{offset + i}.com',
+        'commodity': rng.choice(COMMODITIES),
+        'source': 'DuckDuckGo Search',
+        'snippet': 'Industrial supplier',
+        'quality_score': rng.randint(20, 95),
+    } for i in range(count)]
+
+
+def scan_stats(c):
+    """The queries /api/stats ran before the summary tables"""
+    total_records = c.execute('SELECT COUNT(*) FROM suppliers').fetchone()[0]
+    with_email = c.execute('SELECT COUNT(*) FROM suppliers WHERE email IS NOT NULL AND email != ""').fetchone()[0]
+    with_phone = c.execute('SELECT COUNT(*) FROM suppliers WHERE phone IS NOT NULL AND phone != ""').fetchone()[0]
+    avg_quality = c.execute('SELECT AVG(quality_score) FROM suppliers').fetchone()[0] or 0
+    top_commodities = c.execute(
+        'SELECT commodity, COUNT(*) as count FROM suppliers GROUP BY commodity ORDER BY count DESC LIMIT 10'
+    ).fetchall()
+    return {
+        'total_records': total_records,
+        'with_email': with_email,
+        'with_phone': with_phone,
+        'avg_quality': round(avg_quality, 2),
+        'top_commodities': [{'commodity': row[0], 'count': row[1]} for row in top_commodities]
+    }
+
+
+def comparable(stats):
+    # Ties in the top-10 may come back in either order
+    return dict(stats, top_commodities=sorted((t['count'], t['commodity']) for t in stats['top_commodities']))
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = SupplierDB(os.path.join(tmp, 'suppliers.db'))
+
+            start = time.perf_counter()
+            for offset in range(0, rows, 500):
+                db.save_many(make_records(min(500, rows - offset), rng, offset))
+            insert_time = time.perf_counter() - start
+
+            # Replaces, updates and deletes must keep the totals right too
+            db.save_many(make_records(rows // 10, rng))
+            with db.writer:
+                db.writer.execute('UPDATE OR REPLACE suppliers SET email = NULL, commodity = ? WHERE id % 7 = 0', ('Cheese',))
+                db.writer.execute('DELETE FROM suppliers WHERE id % 11 = 0')
+
+            with db.read() as c:
+                scan_ms = timed(lambda: scan_stats(c), args.repeat)
+                expected = scan_stats(c)
+            summary_ms = timed(db.summary, args.repeat)
+            same = comparable(db.summary()) == comparable(expected)
+            db.close()
+
+        print(f"{rows:>8} rows  insert {rows / insert_time:8.0f} rows/s   stats: scans {scan_ms:8.2f} ms   "
+              f"summary {summary_ms:6.3f} ms   same: {same}")
+
+
+if __name__ == '__main__':
+    main()
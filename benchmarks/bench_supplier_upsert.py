@@ -0,0 +1,96 @@
+"""Bulk insert throughput of INSERT OR REPLACE vs the quality-aware upsert.
+
+Writes the same stream of records, where most are duplicates of an
+earlier (company_name, commodity) with a random quality score, into two
+scratch databases with the full schema (indexes and summary triggers):
+one with the original INSERT OR REPLACE, one with the upsert save_many
+uses. Reports rows/s, and how many kept rows ended up below the best
+quality score seen for their key.
+
+Usage:
+    python benchmarks/bench_supplier_upsert.py --records 50000 --duplicate-rate 0.5 0.8 0.95
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supplier_db import UPSERT_SQL, SupplierDB
+
+REPLACE_SQL = '''INSERT OR REPLACE INTO suppliers
+    (company_name, email, phone, website, commodity, source, snippet, quality_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+
+
+def make_stream(count, duplicate_rate, rng):
+    """Rows as save_many builds them; duplicates reuse an earlier key"""
+    rows, keys = [], []
+    for i in range(count):
+        if keys and rng.random() < duplicate_rate:
+            company, commodity = rng.choice(keys)
+        else:
+            company, commodity = f'Company {i}', rng.choice(['Bearings', 'Cheese', 'Rice', 'Spices'])
+            keys.append((company, commodity))
+        deep = rng.random() < 0.2
+        rows.append((
+            company,
+            f'sales@{company.lower().replace(" ", "")}.com' if deep or rng.random() < 0.3 else None,
+            '(555) 010-1234' if deep else None,
+            f'https://{company.lower().replace(" ", "")}.com' if rng.random() < 0.8 else None,
+            commodity,
+            'Website Deep Scrape' if deep else 'DuckDuckGo Search',
+            'Deep scraped contact' if deep else 'Search snippet',
+            75 if deep else rng.randint(30, 70),
+        ))
+    return rows
+
+
+def run(db, rows, write_batch):
+    start = time.perf_counter()
+    for offset in range(0, len(rows), 200):
+        write_batch(rows[offset:offset + 200])
+    elapsed = time.perf_counter() - start
+
+    best = {}
+    for row in rows:
+        best[(row[0], row[4])] = max(best.get((row[0], row[4]), 0), row[7])
+    with db.read() as c:
+        kept = c.execute('SELECT company_name, commodity, quality_score FROM suppliers').fetchall()
+    downgraded = sum(1 for company, commodity, score in kept if score < best[(company, commodity)])
+    return len(rows) / elapsed, len(kept), downgraded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=50000)
+    parser.add_argument('--duplicate-rate', type=float, nargs='+', default=[0.5, 0.8, 0.95])
+    args = parser.parse_args()
+
+    for rate in args.duplicate_rate:
+        rows = make_stream(args.records, rate, random.Random(3))
+        print(f"\n{args.records} records, {rate:.0%} duplicates:")
+        with tempfile.TemporaryDirectory() as tmp:
+            replace_db = SupplierDB(os.path.join(tmp, 'replace.db'))
+
+            def replace_batch(batch):
+                with replace_db.writer:
+                    replace_db.writer.executemany(REPLACE_SQL, batch)
+
+            upsert_db = SupplierDB(os.path.join(tmp, 'upsert.db'))
+
+            def upsert_batch(batch):
+                with upsert_db.writer:
+                    upsert_db.writer.executemany(UPSERT_SQL, batch)
+
+            for name, db, write_batch in (('replace', replace_db, replace_batch), ('upsert', upsert_db, upsert_batch)):
+                rate_per_s, kept, downgraded = run(db, rows, write_batch)
+                print(f"  {name:<8} {rate_per_s:8.0f} rows/s   {kept} rows kept, {downgraded} below their best quality score")
+                db.close()
+
+
+if __name__ == '__main__':
+    main()
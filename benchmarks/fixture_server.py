@@ -0,0 +1,98 @@
+"""Local HTTP stand-in server serving fixture pages with artificial latency.
+
+Each FixtureServer listens on its own port, so several instances look like
+separate supplier hosts to the fetch layer (host limits key on host:port).
+
+Usage:
+    python benchmarks/fixture_server.py --latency 0.5 --port 8800
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+class FixtureServer:
+    """Serve files from a fixture directory, sleeping `latency` seconds per request"""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=0.3, port=0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.requests_served = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(server.latency)
+                server.requests_served += 1
+
+                path = self.path.split('?')[0].strip('/') or 'index'
+                file_path = os.path.join(server.fixtures_dir, os.path.basename(path))
+                if not file_path.endswith('.html'):
+                    file_path += '.html'
+
+                if not os.path.exists(file_path):
+                    self.send_error(404)
+                    return
+
+                with open(file_path, 'rb') as f:
+                    body = f.read()
+
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve fixture pages with artificial latency')
+    parser.add_argument('--latency', type=float, default=0.3, help='Seconds to sleep before each response')
+    parser.add_argument('--port', type=int, default=8800)
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=args.latency, port=args.port)
+    print(f"Serving {FIXTURES_DIR} at {server.base_url} (latency {args.latency}s)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
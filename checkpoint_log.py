@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+from backup_meta import read_meta, write_meta
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointLog:
+    """Append-only JSONL log of collected records with per-commodity commit markers.
+
+    A finished commodity appends one line per record and then a commit line
+    naming the commodity and its record count. Replay keeps only commodities
+    whose commit line reached the file, so a crash mid-append leaves at most
+    a torn tail that is dropped on the next open. Appends go to the OS right
+    away; sync() fsyncs them in batches, so a checkpoint costs the records
+    added since the previous one rather than a rewrite of everything. Each
+    sync also refreshes a small .meta.json sidecar with the record count
+    per commodity, so the log can be sized up without reading it.
+    """
+
+    def __init__(self, path='supplier_data_log.jsonl'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        # Records per committed commodity in the whole file; None until known
+        # (replay or a fresh file), otherwise the sidecar is left to meta()
+        self.commodity_counts = None
+        self.stats = {'records': 0, 'commodities': 0, 'syncs': 0, 'bytes': 0}
+
+    def exists(self):
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def _open(self):
+        # Caller holds self._lock
+        if self._file is None:
+            if self.commodity_counts is None and not self.exists():
+                self.commodity_counts = {}
+            self._file = open(self.path, 'ab')
+        return self._file
+
+    def append_commodity(self, commodity, records):
+        """Append a finished commodity's records followed by its commit marker"""
+        lines = [json.dumps({'record': record}, ensure_ascii=False, default=str) for record in records]
+        lines.append(json.dumps({'commit': commodity, 'records': len(records), 'time': datetime.now().isoformat()},
+                                ensure_ascii=False))
+        payload = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        with self._lock:
+            f = self._open()
+            f.write(payload)
+            f.flush()  # In the OS page cache: survives a crash of this process
+            self._unsynced += 1
+            if self.commodity_counts is not None:
+                self.commodity_counts[commodity] = self.commodity_counts.get(commodity, 0) + len(records)
+            self.stats['records'] += len(records)
+            self.stats['commodities'] += 1
+            self.stats['bytes'] += len(payload)
+
+    def sync(self):
+        """fsync everything appended since the last sync"""
+        with self._lock:
+            if self._file is None or not self._unsynced:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self.stats['syncs'] += 1
+            if self.commodity_counts is not None:
+                write_meta(self.path, dict(self.commodity_counts))
+
+    def meta(self):
+        """Record counts ({'count', 'commodities', ...}) from the sidecar, rebuilt by one pass if stale"""
+        if not self.exists():
+            return {'count': 0, 'commodities': {}}
+        meta = read_meta(self.path)
+        if meta is None:
+            counts = {}
+            for commodity, records in self.iter_committed():
+                counts[commodity] = counts.get(commodity, 0) + len(records)
+            meta = write_meta(self.path, counts)
+        return meta
+
+    def _iter_commits(self, f):
+        """Yield (commodity, records, end offset) per committed commodity of an open log"""
+        pending = []
+        offset = 0
+        for line in f:
+            offset += len(line)
+            if not line.endswith(b'\n'):
+                return
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                return
+
+            if 'record' in entry:
+                pending.append(entry['record'])
+            elif 'commit' in entry:
+                if entry.get('records') != len(pending):
+                    logger.warning(f"Checkpoint log: commit for {entry['commit']} doesn't match its records, stopping replay")
+                    return
+                yield entry['commit'], pending, offset
+                pending = []
+
+    def iter_committed(self):
+        """Stream (commodity, records) for each committed commodity, one at a time"""
+        if not self.exists():
+            return
+        with open(self.path, 'rb') as f:
+            for commodity, records, _ in self._iter_commits(f):
+                yield commodity, records
+
+    def replay(self):
+        """Return (records, completed commodities) from committed entries.
+
+        Records after the last commit marker (an interrupted commodity) and a
+        partially written line are cut off the file, so appends continue
+        from a clean boundary.
+        """
+        records, completed = [], []
+        if not self.exists():
+            return records, completed
+
+        committed_end = 0
+        counts = {}
+        with self._lock, open(self.path, 'rb') as f:
+            for commodity, commit_records, committed_end in self._iter_commits(f):
+                records.extend(commit_records)
+                completed.append(commodity)
+                counts[commodity] = counts.get(commodity, 0) + len(commit_records)
+            self.commodity_counts = counts
+
+            size = os.path.getsize(self.path)
+            if committed_end < size:
+                # The log is only appended to under this lock, so nothing else is writing
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                with open(self.path, 'r+b') as tail:
+                    tail.truncate(committed_end)
+                logger.warning(f"Checkpoint log: dropped {size - committed_end} bytes of uncommitted entries")
+
+        return records, completed
+
+    def reset(self):
+        """Start a fresh log, keeping the previous one as <path>.prev"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.path):
+                os.replace(self.path, f"{self.path}.prev")
+            self._unsynced = 0
+            self.commodity_counts = {}
+
+    def close(self):
+        self.sync()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
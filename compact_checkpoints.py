@@ -0,0 +1,217 @@
+"""Merge the overlapping checkpoint, export and backup files into one store.
+
+Streams every checkpoint_data_*.csv, supplier_database_*.csv, the JSON
+backup and the checkpoint log row by row into a SQLite file, keeping one
+row per (email, company, commodity) with the highest data_quality_score.
+Memory stays bounded by one write batch whatever the size of the inputs.
+
+Usage:
+    python compact_checkpoints.py                      # merge into supplier_archive.db
+    python compact_checkpoints.py --csv merged.csv     # ...and write it out as one CSV
+    python compact_checkpoints.py --delete             # ...and remove the merged checkpoint CSVs
+"""
+import argparse
+import csv
+import fnmatch
+import glob
+import logging
+import os
+import re
+import sqlite3
+
+from checkpoint_log import CheckpointLog
+from json_stream import iter_json_array
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('company_name', 'email', 'phone', 'website', 'snippet', 'commodity', 'source', 'collection_date',
+           'data_quality_score', 'additional_emails', 'additional_phones')
+
+CHECKPOINT_PATTERN = 'checkpoint_data_*.csv'
+
+
+def default_sources(directory='.'):
+    """Every file holding collected records, oldest kinds first so newer copies win ties"""
+    sources = sorted(glob.glob(os.path.join(directory, CHECKPOINT_PATTERN)))
+    sources += sorted(glob.glob(os.path.join(directory, 'supplier_database_*.csv')))
+    for name in ('supplier_data_backup.json', 'supplier_data_log.jsonl'):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            sources.append(path)
+    return sources
+
+
+def iter_records(path):
+    """Records of one source file as dicts, read incrementally"""
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+    elif path.endswith('.jsonl'):
+        for _, records in CheckpointLog(path).iter_committed():
+            yield from records
+    elif path.endswith('.json'):
+        yield from iter_json_array(path, 'data')
+    else:
+        raise ValueError(f"Don't know how to read {path}")
+
+
+def _normalize(value):
+    return re.sub(r'\s+', ' ', str(value or '')).strip().casefold()
+
+
+def dedup_key(record):
+    """(canonical email, company, commodity); rows without an email dedupe on company and commodity"""
+    email = _normalize(record.get('email'))
+    if email.startswith('mailto:'):
+        email = email[len('mailto:'):]
+    return email, _normalize(record.get('company_name')), _normalize(record.get('commodity'))
+
+
+def quality(record):
+    # app.py records call it quality_score
+    value = record.get('data_quality_score', record.get('quality_score'))
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class CheckpointCompactor:
+    """Upserts records into the consolidated SQLite store, keeping the best-scored copy per key"""
+
+    def __init__(self, output='supplier_archive.db', batch_size=1000):
+        self.output = output
+        self.batch_size = batch_size
+        self.stats = {'files': 0, 'rows': 0, 'input_bytes': 0}
+
+        self.conn = sqlite3.connect(output)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        column_defs = ',\n'.join(
+            f'{column} INTEGER' if column == 'data_quality_score' else f'{column} TEXT' for column in COLUMNS
+        )
+        self.conn.execute(f'''CREATE TABLE IF NOT EXISTS suppliers (
+            email_key TEXT NOT NULL,
+            company_key TEXT NOT NULL,
+            commodity_key TEXT NOT NULL,
+            {column_defs},
+            source_file TEXT,
+            PRIMARY KEY (email_key, company_key, commodity_key)
+        )''')
+        self.conn.commit()
+
+        # Ties go to the later file, so the newest copy of a record is kept
+        updates = ', '.join(f'{column} = excluded.{column}' for column in COLUMNS + ('source_file',))
+        placeholders = ', '.join('?' * (len(COLUMNS) + 4))
+        self.upsert_sql = f'''INSERT INTO suppliers
+            (email_key, company_key, commodity_key, {', '.join(COLUMNS)}, source_file)
+            VALUES ({placeholders})
+            ON CONFLICT (email_key, company_key, commodity_key) DO UPDATE SET {updates}
+            WHERE excluded.data_quality_score >= suppliers.data_quality_score'''
+
+    def _row(self, record, source_file):
+        values = []
+        for column in COLUMNS:
+            if column == 'data_quality_score':
+                values.append(quality(record))
+            else:
+                value = record.get(column)
+                values.append(None if value in (None, '') else str(value))
+        return (*dedup_key(record), *values, os.path.basename(source_file))
+
+    def add_file(self, path):
+        """Stream one source file into the store; returns the number of rows read"""
+        rows = 0
+        batch = []
+        for record in iter_records(path):
+            batch.append(self._row(record, path))
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                rows += len(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+            rows += len(batch)
+
+        self.stats['files'] += 1
+        self.stats['rows'] += rows
+        self.stats['input_bytes'] += os.path.getsize(path)
+        return rows
+
+    def _write(self, batch):
+        with self.conn:
+            self.conn.executemany(self.upsert_sql, batch)
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM suppliers').fetchone()[0]
+
+    def export_csv(self, path):
+        """Write the consolidated records as one CSV, streamed from the store"""
+        cursor = self.conn.execute(
+            f'SELECT {", ".join(COLUMNS)} FROM suppliers ORDER BY commodity, data_quality_score DESC, company_name'
+        )
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for row in cursor:
+                writer.writerow(row)
+
+    def close(self):
+        # Fold the WAL back in so the reported size is the real one
+        self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge checkpoint/export/backup files into one deduplicated store')
+    parser.add_argument('sources', nargs='*', help='Files to merge (default: every checkpoint, export, backup and log file)')
+    parser.add_argument('--output', default='supplier_archive.db', help='Consolidated SQLite store (default: supplier_archive.db)')
+    parser.add_argument('--csv', default=None, metavar='PATH', help='Also write the consolidated records to this CSV')
+    parser.add_argument('--delete', action='store_true',
+                        help='Remove the merged checkpoint_data_*.csv files afterwards (exports, backup and log are kept)')
+    args = parser.parse_args()
+
+    sources = args.sources or default_sources()
+    if not sources:
+        logger.info("Nothing to compact")
+        return
+
+    compactor = CheckpointCompactor(args.output)
+    merged = []
+    for path in sources:
+        try:
+            rows = compactor.add_file(path)
+            logger.info(f"Merged {path}: {rows} rows")
+            merged.append(path)
+        except Exception as e:
+            logger.error(f"Skipped {path}: {e}")
+
+    kept = compactor.count()
+    if args.csv:
+        compactor.export_csv(args.csv)
+    compactor.close()
+    stats = compactor.stats
+
+    output_bytes = os.path.getsize(args.output)
+    # Only files that merged completely are redundant; a skipped one may hold
+    # records that never reached the store
+    checkpoints = [path for path in merged if fnmatch.fnmatch(os.path.basename(path), CHECKPOINT_PATTERN)]
+    checkpoint_bytes = sum(os.path.getsize(path) for path in checkpoints)
+
+    logger.info(f"Read {stats['rows']} rows from {stats['files']} files ({stats['input_bytes'] / 1024 / 1024:.1f} MB), "
+                f"kept {kept} unique records ({stats['rows'] - kept} duplicates dropped)")
+    logger.info(f"Consolidated store {args.output}: {output_bytes / 1024 / 1024:.1f} MB "
+                f"({(stats['input_bytes'] - output_bytes) / 1024 / 1024:.1f} MB smaller than the inputs)")
+
+    if args.delete:
+        for path in checkpoints:
+            os.remove(path)
+        logger.info(f"Removed {len(checkpoints)} checkpoint files: {checkpoint_bytes / 1024 / 1024:.1f} MB reclaimed")
+    elif checkpoints:
+        logger.info(f"{len(checkpoints)} checkpoint files ({checkpoint_bytes / 1024 / 1024:.1f} MB) are now redundant; "
+                    f"--delete reclaims them")
+
+
+if __name__ == '__main__':
+    main()
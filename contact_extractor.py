@@ -0,0 +1,198 @@
+import json
+import re
+import threading
+from urllib.parse import unquote
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b', re.IGNORECASE)
+
+# Common non-business addresses, matched as substrings of the lower-cased email
+EMAIL_BLACKLIST = (
+    'noreply', 'no-reply', 'donotreply', 'info@example', 'test@', 'admin@example',
+    'webmaster@', 'postmaster@', 'abuse@', 'privacy@example'
+)
+
+PHONE_PATTERNS = (
+    r'\+1[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',  # US format with +1
+    r'\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',            # US without +1
+    r'[0-9]{3}-[0-9]{3}-[0-9]{4}',                               # Simple dash format
+    r'[0-9]{3}\.[0-9]{3}\.[0-9]{4}',                            # Dot format
+    r'\([0-9]{3}\)\s[0-9]{3}-[0-9]{4}',                        # (xxx) xxx-xxxx
+    r'[0-9]{10}',                                                # 10 digits
+    r'\+[0-9]{1,3}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}'  # International
+)
+
+# Every phone pattern starts with an optional '(' or '+' and a digit, only
+# spans digits and these separators, and needs at least 10 digits, so each
+# match lies inside one maximal run like this
+PHONE_CANDIDATE = re.compile(r'[(+]?[0-9](?:[()+.\-\s]*[0-9]){9,}[()+.\-\s]*')
+PHONE_DIGITS = re.compile(r'[\d+]')
+
+# Raw-byte signs that a page may hold an email or phone. Each pattern starts
+# with a literal so the regex engine can skip ahead to candidates quickly.
+# An '@' only counts between address characters ('@media'/'@context' don't).
+EMAIL_SIGNALS = (
+    re.compile(rb'@(?<=[A-Za-z0-9._%+-]@)[A-Za-z0-9]'),
+    re.compile(rb'&#(?:0*64|[xX]0*40);'),
+    re.compile(rb'%40(?<=[A-Za-z0-9._%+-]%40)[A-Za-z0-9]'),
+)
+# Spans from a digit to a digit over phone characters; one with 10+ digits
+# can hold a phone number (tags between the digits are not bridged)
+PHONE_SPAN = re.compile(rb'[0-9][0-9()+.\-\s]{8,}[0-9]')
+NON_DIGIT_BYTES = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+
+def has_contact_signals(content):
+    """True if raw page bytes may contain an email or phone number"""
+    if not content:
+        return False
+    if isinstance(content, str):
+        content = content.encode('utf-8', 'ignore')
+
+    # Other letter cases of mailto:/tel: still hit the '@'/digit checks
+    if b'mailto:' in content or b'tel:' in content:
+        return True
+    if any(signal.search(content) for signal in EMAIL_SIGNALS):
+        return True
+    return any(len(span.translate(None, NON_DIGIT_BYTES)) >= 10 for span in PHONE_SPAN.findall(content))
+
+
+def _json_ld_values(node, key, found):
+    """Collect every string stored under `key` anywhere in a JSON-LD document"""
+    if isinstance(node, dict):
+        for k, value in node.items():
+            if k == key:
+                found.extend(v for v in (value if isinstance(value, list) else [value]) if isinstance(v, str))
+            else:
+                _json_ld_values(value, key, found)
+    elif isinstance(node, list):
+        for item in node:
+            _json_ld_values(item, key, found)
+    return found
+
+
+class ContactExtractor:
+    """Precompiled email/phone extraction shared by the scrapers.
+
+    Emails can't contain whitespace, so only whitespace-separated tokens that
+    hold an '@' are searched. Phones take one pass over the text to find runs
+    of phone-like characters with at least 10 digits; the phone patterns then
+    only look inside those runs instead of scanning the whole text once per
+    pattern. Results are the same as running each pattern with re.findall
+    over the full text and keeping matches with at least 10 digits (which
+    every pattern already requires).
+    """
+
+    def __init__(self, blacklist=EMAIL_BLACKLIST, phone_patterns=PHONE_PATTERNS):
+        self.blacklist = re.compile('|'.join(re.escape(skip) for skip in blacklist))
+        self.phone_patterns = [re.compile(pattern) for pattern in phone_patterns]
+
+    def extract_emails(self, text):
+        """Unique email addresses in text, minus blacklisted ones"""
+        if not text or '@' not in text:
+            return []
+        candidates = ' '.join(token for token in text.split() if '@' in token)
+        blacklisted = self.blacklist.search
+        return list({email for email in EMAIL_PATTERN.findall(candidates) if not blacklisted(email.lower())})
+
+    def extract_phones(self, text):
+        """Unique phone numbers (as written) with at least 10 digits"""
+        if not text:
+            return []
+
+        phones = set()
+        for run in PHONE_CANDIDATE.findall(text):
+            for pattern in self.phone_patterns:
+                phones.update(phone.strip() for phone in pattern.findall(run))
+        return list(phones)
+
+    def extract(self, text):
+        """(emails, phones) found in text"""
+        return self.extract_emails(text), self.extract_phones(text)
+
+    def _clean_email(self, value):
+        address = unquote(value.split(':', 1)[-1] if value.lower().startswith('mailto:') else value)
+        return self.extract_emails(address.split('?')[0])
+
+    def _clean_phone(self, value):
+        phone = unquote(value[4:] if value.lower().startswith('tel:') else value).strip()
+        return [phone] if len(PHONE_DIGITS.findall(phone)) >= 10 else []
+
+    def extract_from_page(self, page):
+        """(emails, phones) from a parsed page, looking where sites put contact details first.
+
+        Reads mailto:/tel: links, schema.org JSON-LD and microdata, then
+        footer/address blocks. Only when one of them still comes up empty is
+        the whole page text searched for it, so navigation, scripts and
+        product listings (10-digit SKUs) are normally never scanned.
+        """
+        emails, phones = set(), set()
+
+        for href in page.contact_hrefs():
+            if href[:7].lower() == 'mailto:':
+                emails.update(self._clean_email(href))
+            else:
+                phones.update(self._clean_phone(href))
+
+        for raw in page.json_ld():
+            try:
+                document = json.loads(raw)
+            except ValueError:
+                continue
+            for value in _json_ld_values(document, 'email', []):
+                emails.update(self._clean_email(value))
+            for value in _json_ld_values(document, 'telephone', []):
+                phones.update(self._clean_phone(value))
+
+        for prop, value in page.itemprops():
+            if prop == 'email':
+                emails.update(self._clean_email(value))
+            else:
+                phones.update(self._clean_phone(value))
+
+        if not (emails and phones):
+            for block in page.block_texts():
+                emails.update(self.extract_emails(block))
+                phones.update(self.extract_phones(block))
+
+        if not (emails and phones):
+            text = page.text()
+            if not emails:
+                emails.update(self.extract_emails(text))
+            if not phones:
+                phones.update(self.extract_phones(text))
+
+        return list(emails), list(phones)
+
+
+class ContactPrefilter:
+    """Cheap check on raw page bytes before a page is parsed for contacts.
+
+    Pages without any contact signal can't yield an email or phone, so the
+    callers skip extraction (and parsing, unless the links are still needed).
+    Counts how many pages and bytes were short-circuited.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {'pages': 0, 'skipped': 0, 'bytes_skipped': 0}
+
+    def has_signals(self, content):
+        """has_contact_signals(), counted"""
+        found = has_contact_signals(content)
+        self.record(found, len(content or b''))
+        return found
+
+    def record(self, found, size):
+        """Count a check made elsewhere (e.g. in a parse worker process)"""
+        with self._lock:
+            self.stats['pages'] += 1
+            if not found:
+                self.stats['skipped'] += 1
+                self.stats['bytes_skipped'] += size
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+default_extractor = ContactExtractor()
@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import threading
+from urllib.parse import urlsplit
+
+from url_utils import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+# Directories and platforms host many unrelated companies, so their pages are
+# memoized per URL instead of per domain
+SHARED_PLATFORM_DOMAINS = {
+    'thomasnet.com', 'linkedin.com', 'facebook.com', 'yelp.com', 'yellowpages.com',
+    'alibaba.com', 'amazon.com', 'ebay.com', 'indeed.com', 'bbb.org', 'manta.com',
+    'wikipedia.org', 'youtube.com', 'instagram.com', 'twitter.com', 'x.com',
+    'google.com', 'duckduckgo.com', 'made-in-china.com', 'globalspec.com',
+}
+
+
+class ContactMemo:
+    """Run-wide memo from registrable domain to deep-scraped emails/phones.
+
+    A site that shows up for several commodities is deep-scraped once; later
+    lookups get the stored emails/phones without any network request. Sites
+    that were read but yielded nothing are remembered too (as empty lists);
+    callers don't store sites that failed to load. When `path` is
+    given the memo is loaded from and saved to that JSON file so it also
+    carries over between runs.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                logger.info(f"Loaded contact memo: {len(self.entries)} domains")
+            except Exception as e:
+                logger.warning(f"Could not load contact memo: {e}")
+
+    def key(self, url):
+        domain = registrable_domain(url)
+        if domain in SHARED_PLATFORM_DOMAINS:
+            parts = urlsplit(url)
+            return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+        return domain
+
+    def get(self, url):
+        """Memoized {'emails', 'phones'} for the url's site, or None if never scraped"""
+        with self._lock:
+            entry = self.entries.get(self.key(url))
+            self.stats['hits' if entry is not None else 'misses'] += 1
+            return entry
+
+    def put(self, url, emails, phones):
+        with self._lock:
+            self.entries[self.key(url)] = {'emails': list(emails), 'phones': list(phones)}
+
+    def contact_info(self, url, company_name=None):
+        """Deep-scrape style result for `url` built from the memo, or None if it has no contacts"""
+        with self._lock:
+            entry = self.entries.get(self.key(url))
+        if not entry or not (entry['emails'] or entry['phones']):
+            return None
+        return {
+            'company_name': company_name or f"Contact from {url}",
+            'website': url,
+            'emails': list(entry['emails']),
+            'phones': list(entry['phones']),
+            'source': 'Website Deep Scrape'
+        }
+
+    def save(self):
+        """Write the memo to `path` (no-op for a run-only memo)"""
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                snapshot = json.dumps(self.entries, ensure_ascii=False)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save contact memo: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['domains'] = len(self.entries)
+        return stats
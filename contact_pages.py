@@ -0,0 +1,65 @@
+from urllib.parse import urlsplit
+
+from url_utils import canonicalize_url, url_dedup_key
+
+# Path segments that are almost always the contact page itself
+CONTACT_PATHS = {'contact', 'contact-us', 'contactus', 'contact_us', 'contacts', 'kontakt'}
+
+# (keyword, score if in the link path, score if only in the link text);
+# highest match wins, so a /contact link always beats an "about" one
+CONTACT_KEYWORDS = (
+    ('contact', 80, 70),
+    ('about', 40, 35),
+    ('reach', 30, 30),
+    ('connect', 25, 25),
+    ('support', 20, 15),
+    ('info', 10, 10),
+)
+
+
+def _site_host(url):
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def score_contact_link(url, text):
+    """Score a candidate link by how likely it is to be the site's contact page (0 = not a candidate)"""
+    path = urlsplit(url).path.lower()
+    segments = [s for s in path.split('/') if s]
+    last = segments[-1].rsplit('.', 1)[0] if segments else ''
+    if last in CONTACT_PATHS:
+        # Exact /contact pages first, shallower ones before nested ones
+        return 100 - len(segments)
+
+    text = text.lower()
+    best = 0
+    for keyword, path_score, text_score in CONTACT_KEYWORDS:
+        if keyword in path:
+            best = max(best, path_score)
+        elif keyword in text:
+            best = max(best, text_score)
+    return best
+
+
+def rank_contact_links(links, page_url, limit=3):
+    """Best contact page candidates among a page's (href, text) links: same host only, deduped, highest score first"""
+    page_host = _site_host(page_url)
+    page_key = url_dedup_key(page_url)
+    candidates = {}
+
+    for position, (href, text) in enumerate(links):
+        url = canonicalize_url(href, base=page_url)
+        if not url or _site_host(url) != page_host:
+            continue
+
+        key = url_dedup_key(url)
+        if key == page_key:
+            continue
+
+        score = score_contact_link(url, text)
+        if score and (key not in candidates or score > candidates[key][0]):
+            candidates[key] = (score, position if key not in candidates else candidates[key][1], url)
+
+    # Ties keep document order
+    ranked = sorted(candidates.values(), key=lambda c: (-c[0], c[1]))
+    return [url for _, _, url in ranked[:limit]]
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlparse
+
+from http_pool import get_shared_pool
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetchEngine:
+    """Asyncio fetch engine with a global concurrency cap and per-host limits.
+
+    The blocking fetch function (the shared SessionPool's ``get`` by default)
+    runs on a shared, bounded thread pool, so many pages can be in flight
+    while callers write plain ``async``/``await`` orchestration code. All
+    run() calls share one long-lived event loop thread, so the limits hold
+    across every caller, e.g. concurrent commodity workers.
+    """
+
+    def __init__(self, fetch_func=None, max_concurrency=16, per_host_limit=2, timeout=12):
+        self.fetch_func = fetch_func or get_shared_pool().get
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='fetch')
+        self._lock = threading.Lock()
+        self._loop = None
+        self._loop_thread = None
+        # Only touched from the engine's loop thread
+        self._global_semaphore = None
+        self._host_semaphores = {}
+        self.stats = {'requests': 0, 'errors': 0}
+
+    def _get_loop(self):
+        """The engine's event loop, started on a daemon thread on first use"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name='fetch-loop', daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    def _host_semaphore(self, url):
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def fetch(self, url, **kwargs):
+        """Fetch a single URL, returning the response or None on error.
+
+        Must run on the engine's loop (inside a coroutine passed to run()),
+        where the semaphores live.
+        """
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        kwargs.setdefault('timeout', self.timeout)
+        loop = asyncio.get_running_loop()
+
+        async with self._host_semaphore(url):
+            async with self._global_semaphore:
+                try:
+                    with self._lock:
+                        self.stats['requests'] += 1
+                    return await loop.run_in_executor(self.executor, partial(self.fetch_func, url, **kwargs))
+                except Exception as e:
+                    with self._lock:
+                        self.stats['errors'] += 1
+                    logger.debug(f"Fetch failed for {url}: {e}")
+                    return None
+
+    async def fetch_many(self, urls, **kwargs):
+        """Fetch several URLs concurrently, preserving input order"""
+        return await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls))
+
+    def run(self, coro_func, *args, **kwargs):
+        """Run an async orchestration function from synchronous code, on the engine's loop"""
+        loop = self._get_loop()
+        if threading.current_thread() is self._loop_thread:
+            raise RuntimeError("AsyncFetchEngine.run() called from the engine's own loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro_func(*args, **kwargs), loop).result()
+
+    def shutdown(self):
+        """Release the worker threads and stop the event loop"""
+        self.executor.shutdown(wait=False)
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+                self._loop_thread = None
+                self._global_semaphore = None
+                self._host_semaphores = {}
@@ -0,0 +1,312 @@
+import copy
+import logging
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+# Fastest first; 'bs4' (BeautifulSoup + html.parser) needs no extra packages
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+DEFAULT_BACKEND = 'lxml'
+
+# Microdata properties holding contact details
+CONTACT_ITEMPROPS = ('email', 'telephone')
+
+# Elements whose content BeautifulSoup's get_text() leaves out
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+CONTACT_HREF = re.compile(r'^\s*(mailto|tel):', re.IGNORECASE)
+
+# Search result containers: desktop (div.g, sokoban blocks) and basic HTML (Gx5Zad) Google
+GOOGLE_RESULT_CLASSES = ('g', 'Gx5Zad')
+GOOGLE_RESULT_ATTRS = ('data-sokoban-container',)
+DUCKDUCKGO_RESULT_CLASSES = ('result',)
+
+
+def available_backends():
+    return [name for name, present in zip(BACKENDS, (HAS_SELECTOLAX, HAS_LXML, True)) if present]
+
+
+class SoupPage:
+    """Page text and links from a BeautifulSoup tree (the original behaviour)"""
+
+    def __init__(self, content, features='html.parser'):
+        self.soup = BeautifulSoup(content, features)
+
+    def text(self):
+        return self.soup.get_text()
+
+    def links(self):
+        """(href, link text) for every <a href>"""
+        return [(link['href'], link.get_text()) for link in self.soup.find_all('a', href=True)]
+
+    def contact_hrefs(self):
+        """mailto:/tel: link targets"""
+        return [link['href'].strip() for link in self.soup.find_all('a', href=CONTACT_HREF)]
+
+    def json_ld(self):
+        """Raw bodies of the application/ld+json scripts"""
+        return [script.get_text() for script in self.soup.find_all('script', type='application/ld+json')]
+
+    def itemprops(self):
+        """(property, value) for microdata email/telephone properties"""
+        found = []
+        for tag in self.soup.find_all(attrs={'itemprop': True}):
+            for prop in tag['itemprop'].lower().split():
+                if prop in CONTACT_ITEMPROPS:
+                    found.append((prop, tag.get('content') or tag.get('href') or tag.get_text()))
+        return found
+
+    def block_texts(self):
+        """Text of <footer>/<address> blocks and elements whose id/class mention footer"""
+        def is_block(tag):
+            return (tag.name in ('footer', 'address') or 'footer' in (tag.get('id') or '')
+                    or any('footer' in c for c in tag.get('class') or ()))
+        return [block.get_text() for block in self.soup.find_all(is_block)]
+
+
+class LxmlPage:
+    """Page text and links straight from an lxml tree, no BeautifulSoup objects"""
+
+    def __init__(self, content):
+        self.root = None
+        if not content:
+            return
+        try:
+            # Decoded text keeps UTF-8 pages without a charset declaration intact
+            if isinstance(content, bytes):
+                content = content.decode('utf-8')
+            self.root = lxml.html.document_fromstring(content)
+        except (UnicodeDecodeError, ValueError):
+            # Non UTF-8 bytes or an <?xml encoding?> declaration: let lxml sniff it
+            try:
+                self.root = lxml.html.document_fromstring(content.encode('utf-8') if isinstance(content, str) else content)
+            except Exception:
+                self.root = None
+        except Exception:
+            self.root = None
+
+    def text(self):
+        if self.root is None:
+            return ''
+        if self.root.find('.//script') is None and self.root.find('.//style') is None and self.root.find('.//template') is None:
+            return self.root.text_content()
+        # Match get_text(): drop script/style bodies, on a copy so json_ld() still works
+        root = copy.deepcopy(self.root)
+        etree.strip_elements(root, *NON_TEXT_TAGS, with_tail=False)
+        return root.text_content()
+
+    def links(self):
+        if self.root is None:
+            return []
+        return [(link.get('href'), link.text_content()) for link in self.root.iter('a') if link.get('href') is not None]
+
+    def contact_hrefs(self):
+        if self.root is None:
+            return []
+        hrefs = self.root.xpath(
+            '//a/@href[starts-with(translate(normalize-space(substring(., 1, 12)), "MAILTOE", "mailtoe"), "mailto:")'
+            ' or starts-with(translate(normalize-space(substring(., 1, 12)), "TEL", "tel"), "tel:")]'
+        )
+        return [href.strip() for href in hrefs]
+
+    def json_ld(self):
+        if self.root is None:
+            return []
+        return [script.text_content() for script in self.root.xpath('//script[@type="application/ld+json"]')]
+
+    def itemprops(self):
+        if self.root is None:
+            return []
+        found = []
+        for tag in self.root.xpath('//*[@itemprop]'):
+            for prop in tag.get('itemprop').lower().split():
+                if prop in CONTACT_ITEMPROPS:
+                    found.append((prop, tag.get('content') or tag.get('href') or tag.text_content()))
+        return found
+
+    def block_texts(self):
+        if self.root is None:
+            return []
+        blocks = self.root.xpath('//footer | //address | //*[contains(@id, "footer") or contains(@class, "footer")]')
+        return [block.text_content() for block in blocks]
+
+
+class SelectolaxPage:
+    """Page text and links from selectolax (lexbor/modest), the fastest backend"""
+
+    def __init__(self, content):
+        self.content = content or b''
+        self.tree = SelectolaxParser(self.content)
+
+    def text(self):
+        if not self.tree.css_first('script, style, template'):
+            root = self.tree.root
+            return root.text(deep=True) if root is not None else ''
+        # Match get_text(): drop script/style bodies, on a fresh tree so json_ld() still works
+        tree = SelectolaxParser(self.content)
+        tree.strip_tags(list(NON_TEXT_TAGS))
+        return tree.root.text(deep=True) if tree.root is not None else ''
+
+    def links(self):
+        return [(node.attributes.get('href') or '', node.text(deep=True)) for node in self.tree.css('a[href]')]
+
+    def contact_hrefs(self):
+        nodes = self.tree.css('a[href^="mailto:" i], a[href^="tel:" i]')
+        return [(node.attributes.get('href') or '').strip() for node in nodes]
+
+    def json_ld(self):
+        return [node.text(deep=True) for node in self.tree.css('script[type="application/ld+json"]')]
+
+    def itemprops(self):
+        found = []
+        for node in self.tree.css('[itemprop]'):
+            attributes = node.attributes
+            for prop in (attributes.get('itemprop') or '').lower().split():
+                if prop in CONTACT_ITEMPROPS:
+                    found.append((prop, attributes.get('content') or attributes.get('href') or node.text(deep=True)))
+        return found
+
+    def block_texts(self):
+        blocks = self.tree.css('footer, address, [id*="footer" i], [class*="footer" i]')
+        return [node.text(deep=True) for node in blocks]
+
+
+PAGE_CLASSES = {'selectolax': SelectolaxPage, 'lxml': LxmlPage, 'bs4': SoupPage}
+
+_backend = None
+
+
+def set_backend(name):
+    """Select the parser backend; unavailable ones fall back to the next fastest"""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{name}' (choose from {', '.join(BACKENDS)})")
+
+    available = available_backends()
+    if name not in available:
+        fallback = next(b for b in BACKENDS[BACKENDS.index(name):] if b in available)
+        logger.warning(f"HTML parser backend '{name}' is not installed, using '{fallback}'")
+        name = fallback
+    _backend = name
+    return name
+
+
+def configure_backend(strict=False):
+    """Select the backend named by $HTML_PARSER_BACKEND (default lxml); call once at startup.
+
+    An unknown name raises ValueError when `strict`, otherwise it is logged
+    and lxml is used, so a typo can't make every parse fail later on.
+    """
+    name = os.environ.get('HTML_PARSER_BACKEND', DEFAULT_BACKEND)
+    if name not in BACKENDS and not strict:
+        logger.warning(f"Unknown HTML_PARSER_BACKEND '{name}' (choose from {', '.join(BACKENDS)}), using '{DEFAULT_BACKEND}'")
+        name = DEFAULT_BACKEND
+    return set_backend(name)
+
+
+def get_backend():
+    if _backend is None:
+        configure_backend()
+    return _backend
+
+
+def parse_page(content, backend=None):
+    """Parse a fetched page for text and link extraction with the selected backend"""
+    return PAGE_CLASSES[backend or get_backend()](content)
+
+
+def make_soup(content, backend=None, parse_only=None):
+    """BeautifulSoup tree for the search-result parsers.
+
+    Those parsers use BeautifulSoup's find API, so the fast backends only swap
+    the tree builder to lxml; 'bs4' keeps the original html.parser. With
+    `parse_only` (a SoupStrainer) only the matching elements and their
+    subtrees are built, the rest of the page is skipped while parsing.
+    """
+    backend = backend or get_backend()
+    features = 'lxml' if backend != 'bs4' and HAS_LXML else 'html.parser'
+    return BeautifulSoup(content, features, parse_only=parse_only)
+
+
+def _name_and_classes(tag, attrs):
+    # SoupStrainer calls with (name, attrs) while parsing, with the raw class
+    # string; find_all calls with the Tag, whose class is already a list
+    if attrs is None:
+        tag, attrs = tag.name, tag.attrs
+    classes = attrs.get('class') or ()
+    if isinstance(classes, str):
+        classes = classes.split()
+    return tag, attrs, classes
+
+
+def is_google_result(tag, attrs=None):
+    """div.g, div[data-sokoban-container] or div.Gx5Zad, usable as strainer and find_all filter"""
+    name, attrs, classes = _name_and_classes(tag, attrs)
+    return name == 'div' and (any(c in GOOGLE_RESULT_CLASSES for c in classes)
+                              or any(a in attrs for a in GOOGLE_RESULT_ATTRS))
+
+
+def is_duckduckgo_result(tag, attrs=None):
+    """div.result, usable as strainer and find_all filter"""
+    name, attrs, classes = _name_and_classes(tag, attrs)
+    return name == 'div' and any(c in DUCKDUCKGO_RESULT_CLASSES for c in classes)
+
+
+class ResultStrainer(SoupStrainer):
+    """Keeps only top-level elements for which `is_result(name, attrs)` is true.
+
+    A plain SoupStrainer can't express "class g OR data-sokoban-container", and
+    beautifulsoup4 4.13 stopped passing attributes to name functions, so the
+    parse-time hooks of both APIs are overridden directly.
+    """
+
+    def __init__(self, is_result):
+        super().__init__()
+        self.is_result = is_result
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # beautifulsoup4 < 4.13
+        return bool(markup_name) and self.is_result(markup_name, markup_attrs or {})
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # beautifulsoup4 >= 4.13
+        return self.is_result(name, attrs or {})
+
+    def allow_string_creation(self, string):
+        # Text outside the result containers is never needed
+        return False
+
+
+def result_soup(content, is_result, backend=None):
+    """Soup holding only the search result containers matched by `is_result`"""
+    return make_soup(content, backend, parse_only=ResultStrainer(is_result))
+
+
+def find_results(soup, is_result):
+    """Result containers in page order, in one pass over the tree.
+
+    A container nested in one already found (e.g. the sokoban block inside a
+    div.g, or sitelinks inside a result) is the same result and is skipped.
+    """
+    containers = []
+    for tag in soup.find_all(is_result):
+        if containers and any(parent is containers[-1] for parent in tag.parents):
+            continue
+        containers.append(tag)
+    return containers
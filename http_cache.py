@@ -0,0 +1,241 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from url_utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Only headers needed to rebuild a response or revalidate it are kept
+STORED_HEADERS = ('content-type', 'etag', 'last-modified', 'cache-control', 'date')
+
+
+def cache_directives(cache_control):
+    """Parse a Cache-Control header into {directive: value or None}"""
+    directives = {}
+    for part in (cache_control or '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip().strip('"') or None
+    return directives
+
+
+class DiskCache:
+    """Content-addressed on-disk HTTP response cache.
+
+    Layout under `cache_dir`:
+        entries/<sha256(normalized url)>.json  - status, headers, body hash, timestamps
+        blobs/<sha256(body)>.z                 - zlib-compressed body, shared by identical pages
+
+    Entries younger than `fresh_ttl` (or the response's max-age, if shorter)
+    are served without touching the network; older ones, and no-cache ones,
+    are revalidated with If-None-Match / If-Modified-Since. no-store responses
+    are never written. Entries
+    older than `max_age` are evicted, and the least recently used entries go
+    first once the cache grows past `max_size_bytes`.
+    """
+
+    def __init__(self, cache_dir='.http_cache', fresh_ttl=24 * 3600, max_age=30 * 24 * 3600,
+                 max_size_bytes=500 * 1024 * 1024, evict_every=200):
+        self.cache_dir = cache_dir
+        self.entries_dir = os.path.join(cache_dir, 'entries')
+        self.blobs_dir = os.path.join(cache_dir, 'blobs')
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self.max_size_bytes = max_size_bytes
+        self.evict_every = evict_every
+        self._puts_since_evict = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evicted': 0}
+
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.blobs_dir, exist_ok=True)
+
+    def _entry_path(self, url):
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.entries_dir, f"{key}.json")
+
+    def _blob_path(self, body_hash):
+        return os.path.join(self.blobs_dir, f"{body_hash}.z")
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def record(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, url):
+        """Load the cached entry for `url` (with its body), or None"""
+        try:
+            entry_path = self._entry_path(url)
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if time.time() - entry['stored_at'] > self.max_age:
+                return None
+            with open(self._blob_path(entry['body_hash']), 'rb') as f:
+                entry['body'] = zlib.decompress(f.read())
+            # mtime doubles as the last-access time for LRU eviction
+            os.utime(entry_path)
+            return entry
+        except (OSError, ValueError, KeyError, zlib.error):
+            return None
+
+    def is_fresh(self, entry):
+        directives = cache_directives(entry['headers'].get('cache-control'))
+        if 'no-cache' in directives:
+            return False
+        ttl = self.fresh_ttl
+        try:
+            ttl = min(ttl, int(directives['max-age']))
+        except (KeyError, TypeError, ValueError):
+            pass
+        return time.time() - entry['stored_at'] < ttl
+
+    def validation_headers(self, entry):
+        """Conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry['headers'].get('etag'):
+            headers['If-None-Match'] = entry['headers']['etag']
+        if entry['headers'].get('last-modified'):
+            headers['If-Modified-Since'] = entry['headers']['last-modified']
+        return headers
+
+    def put(self, url, response):
+        """Store a 200 response, unless it is marked no-store"""
+        if 'no-store' in cache_directives(response.headers.get('cache-control')):
+            return
+        try:
+            body = response.content
+            body_hash = hashlib.sha256(body).hexdigest()
+            blob_path = self._blob_path(body_hash)
+            if not os.path.exists(blob_path):
+                self._write_atomic(blob_path, zlib.compress(body, 6))
+
+            entry = {
+                'url': response.url or url,
+                'status': response.status_code,
+                'headers': {k: response.headers[k] for k in STORED_HEADERS if k in response.headers},
+                'body_hash': body_hash,
+                'stored_at': time.time()
+            }
+            self._write_atomic(self._entry_path(url), json.dumps(entry).encode('utf-8'))
+            self.record('stores')
+        except Exception as e:
+            logger.debug(f"Cache store failed for {url}: {e}")
+            return
+
+        with self._lock:
+            self._puts_since_evict += 1
+            run_eviction = self._puts_since_evict >= self.evict_every
+            if run_eviction:
+                self._puts_since_evict = 0
+        if run_eviction:
+            self.evict()
+
+    def refresh(self, url, entry, response=None):
+        """Mark an entry as freshly validated after a 304, merging any new validators"""
+        entry = {k: v for k, v in entry.items() if k != 'body'}
+        if response is not None:
+            for k in ('etag', 'last-modified', 'cache-control', 'date'):
+                if k in response.headers:
+                    entry['headers'][k] = response.headers[k]
+        entry['stored_at'] = time.time()
+        try:
+            self._write_atomic(self._entry_path(url), json.dumps(entry).encode('utf-8'))
+        except OSError as e:
+            logger.debug(f"Cache refresh failed for {url}: {e}")
+
+    def to_response(self, entry):
+        """Rebuild a requests.Response from a cache entry"""
+        response = Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.url = entry['url']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under the size cap"""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.entries_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.entries_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                entries.append((os.path.getmtime(path), path, entry))
+            except (OSError, ValueError):
+                continue
+
+        removed = 0
+        live = []
+        for accessed, path, entry in entries:
+            if now - entry.get('stored_at', 0) > self.max_age:
+                self._remove(path)
+                removed += 1
+            else:
+                live.append((accessed, path, entry))
+
+        blob_sizes = {}
+        for name in os.listdir(self.blobs_dir):
+            if not name.endswith('.z'):
+                continue
+            try:
+                blob_sizes[name[:-2]] = os.path.getsize(os.path.join(self.blobs_dir, name))
+            except OSError:
+                continue
+
+        # Oldest access first; shared blobs only count once
+        live.sort(key=lambda item: item[0])
+        referenced = {}
+        for _, _, entry in live:
+            referenced[entry['body_hash']] = referenced.get(entry['body_hash'], 0) + 1
+        total = sum(blob_sizes.get(h, 0) for h in referenced)
+
+        for accessed, path, entry in live:
+            if total <= self.max_size_bytes:
+                break
+            self._remove(path)
+            removed += 1
+            referenced[entry['body_hash']] -= 1
+            if referenced[entry['body_hash']] == 0:
+                total -= blob_sizes.get(entry['body_hash'], 0)
+
+        # Blobs no longer referenced by any entry
+        for body_hash in blob_sizes:
+            if referenced.get(body_hash, 0) == 0:
+                self._remove(self._blob_path(body_hash))
+
+        with self._lock:
+            self.stats['evicted'] += removed
+        if removed:
+            logger.info(f"HTTP cache: evicted {removed} entries ({total / 1024 / 1024:.1f} MB kept)")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['local_rate'] = round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else 0
+        return stats
@@ -0,0 +1,227 @@
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import DiskCache
+from politeness import DomainScheduler
+
+logger = logging.getLogger(__name__)
+
+# Content types worth downloading and parsing for contact details
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Search engines and directories are hit by every commodity; a couple of
+# warm connections is all they need. Supplier sites use the default size.
+DEFAULT_HOST_POOL_SIZES = {
+    'www.google.com': 2,
+    'duckduckgo.com': 2,
+    'html.duckduckgo.com': 2,
+    'www.thomasnet.com': 2,
+}
+
+# Result pages change from one search to the next and are cached, parsed,
+# by search_cache.SearchCache; the HTTP cache would only serve stale ones
+DEFAULT_UNCACHED_HOSTS = frozenset(DEFAULT_HOST_POOL_SIZES)
+
+
+class SessionPool:
+    """Shared keep-alive HTTP session with per-host connection pools.
+
+    A single requests.Session keeps TCP+TLS connections open between calls,
+    so repeat requests to a host skip the handshake. Hosts listed in
+    `host_pool_sizes` get their own adapter with a dedicated pool size.
+    When a `scheduler` is given, every request first waits for its host's
+    politeness slot. When a `cache` is given, GETs are served from it while
+    fresh and revalidated with conditional requests once stale; hosts in
+    `uncached_hosts` always go to the network.
+    """
+
+    def __init__(self, pool_connections=100, pool_maxsize=10, host_pool_sizes=None, scheduler=None, cache=None,
+                 uncached_hosts=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(DEFAULT_HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes)
+        self.session = requests.Session()
+        self.scheduler = scheduler
+        self.cache = cache
+        self.uncached_hosts = frozenset(DEFAULT_UNCACHED_HOSTS if uncached_hosts is None else uncached_hosts)
+        self._adapters = {}
+        self._lock = threading.Lock()
+        self.host_requests = {}
+        self.download_stats = {'bytes_read': 0, 'bytes_saved': 0, 'truncated': 0, 'non_html_skipped': 0}
+
+        default_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+        self._adapters['*'] = default_adapter
+
+        for host, size in self.host_pool_sizes.items():
+            self.set_host_pool_size(host, size)
+
+    def set_host_pool_size(self, host, size):
+        """Give a host its own connection pool of `size` connections"""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        with self._lock:
+            self.session.mount(f'http://{host}/', adapter)
+            self.session.mount(f'https://{host}/', adapter)
+            self._adapters[host] = adapter
+            self.host_pool_sizes[host] = size
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the shared session"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            self.host_requests[host] = self.host_requests.get(host, 0) + 1
+        if self.scheduler:
+            self.scheduler.acquire(url)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        if self.cache is None or urlparse(url).netloc.lower() in self.uncached_hosts:
+            return self._send_get(url, **kwargs)
+        
+        entry = self.cache.get(url)
+        if entry and self.cache.is_fresh(entry):
+            self.cache.record('hits')
+            return self._from_cache(entry, **kwargs)
+        
+        if entry:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.validation_headers(entry)}
+        
+        response = self._send_get(url, **kwargs)
+        if response is None:
+            return None
+        
+        if entry and response.status_code == 304:
+            self.cache.record('revalidated')
+            self.cache.refresh(url, entry, response)
+            return self._from_cache(entry, **kwargs)
+        
+        self.cache.record('misses')
+        # A body cut at max_bytes isn't the page; caching it would serve the
+        # cut copy to every later caller, whatever their byte budget
+        if response.status_code == 200 and not getattr(response, 'truncated', False):
+            self.cache.put(url, response)
+        return response
+
+    def _from_cache(self, entry, max_bytes=None, html_only=False, **kwargs):
+        """Cached response held to the same content-type gate and byte budget as a download"""
+        response = self.cache.to_response(entry)
+        content_type = response.headers.get('Content-Type', '').lower()
+        if html_only and content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+            with self._lock:
+                self.download_stats['non_html_skipped'] += 1
+            return None
+        if max_bytes is not None and len(response._content) > max_bytes:
+            response._content = response._content[:max_bytes]
+            response.truncated = True
+        return response
+
+    def fetch_html(self, url, max_bytes=512 * 1024, **kwargs):
+        """GET an HTML page, streaming at most `max_bytes` of body.
+        
+        Returns None without reading the body when the server declares a
+        non-HTML Content-Type (PDFs, images, archives...).
+        """
+        return self.get(url, max_bytes=max_bytes, html_only=True, **kwargs)
+
+    def _send_get(self, url, max_bytes=None, html_only=False, **kwargs):
+        if max_bytes is None and not html_only:
+            return self.request('GET', url, **kwargs)
+        
+        response = self.request('GET', url, stream=True, **kwargs)
+        if response.status_code != 200:
+            # Error and 304 bodies are never used; release the connection
+            response.close()
+            response._content = b''
+            response._content_consumed = True
+            return response
+        
+        declared_length = int(response.headers.get('Content-Length') or 0)
+        content_type = response.headers.get('Content-Type', '').lower()
+        
+        if html_only and content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+            response.close()
+            with self._lock:
+                self.download_stats['non_html_skipped'] += 1
+                self.download_stats['bytes_saved'] += declared_length
+            return None
+        
+        body = bytearray()
+        truncated = False
+        try:
+            for chunk in response.iter_content(chunk_size=16384):
+                body.extend(chunk)
+                if max_bytes is not None and len(body) >= max_bytes:
+                    truncated = True
+                    break
+        finally:
+            response.close()
+        
+        if truncated:
+            del body[max_bytes:]
+        response._content = bytes(body)
+        response._content_consumed = True
+        response.truncated = truncated
+        
+        with self._lock:
+            self.download_stats['bytes_read'] += len(body)
+            if truncated:
+                self.download_stats['truncated'] += 1
+                self.download_stats['bytes_saved'] += max(declared_length - len(body), 0)
+        return response
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def get_stats(self):
+        """Per-host request counts and connections opened (for pools still cached)"""
+        hosts = {}
+        with self._lock:
+            adapters = list(self._adapters.values())
+            host_requests = dict(self.host_requests)
+
+        for adapter in adapters:
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+                entry = hosts.setdefault(host, {'requests': 0, 'connections_opened': 0, 'pool_maxsize': pool.pool.maxsize if pool.pool else 0})
+                entry['connections_opened'] += pool.num_connections
+
+        for host, count in host_requests.items():
+            hosts.setdefault(host, {'requests': 0, 'connections_opened': 0, 'pool_maxsize': 0})['requests'] = count
+
+        total_requests = sum(h['requests'] for h in hosts.values())
+        total_connections = sum(h['connections_opened'] for h in hosts.values())
+        with self._lock:
+            download_stats = dict(self.download_stats)
+        return {
+            'downloads': download_stats,
+            'total_requests': total_requests,
+            'connections_opened': total_connections,
+            'connection_reuse_rate': round(1 - total_connections / total_requests, 3) if total_requests else 0,
+            'hosts': hosts
+        }
+
+    def close(self):
+        self.session.close()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool():
+    """Get the process-wide SessionPool used by all scraper sources"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = SessionPool(scheduler=DomainScheduler(), cache=DiskCache())
+        return _shared_pool
@@ -0,0 +1,102 @@
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """Character buffer over a text file, refilled in chunks as the parser needs more"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer stays around one chunk
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, without consuming it ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value, reading further chunks until it is whole"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if self.fill():
+                    continue
+                raise
+            # A number cut off by the end of the buffer ("12", "2.", "2.5e")
+            # may continue in the next chunk
+            if (isinstance(value, (int, float)) and not isinstance(value, bool) and not self.eof
+                    and (end == len(self.buffer) or self.buffer[end] in '.eE+-') and self.fill()):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_object_items(f, array_key, chunk_size=64 * 1024):
+    """Walk a top-level JSON object, yielding (key, value) for its members.
+
+    The `array_key` member must be an array and is yielded element by
+    element as (array_key, element), so memory stays around one element
+    plus one chunk however long the array is; other members are decoded
+    whole.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == array_key:
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.peek() == ']':
+                        reader.pos += 1
+                        break
+                    reader.expect(',')
+        else:
+            yield key, reader.value()
+
+        if reader.peek() == '}':
+            return
+        reader.expect(',')
+
+
+def iter_json_array(path, key, chunk_size=64 * 1024):
+    """Elements of the `key` array of the JSON object in `path`, one at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for item_key, value in iter_object_items(f, key, chunk_size):
+            if item_key == key:
+                yield value
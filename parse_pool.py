@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from contact_extractor import default_extractor, has_contact_signals
+from contact_pages import rank_contact_links
+from html_parser import get_backend, parse_page
+
+logger = logging.getLogger(__name__)
+
+# ProcessPoolExecutor(max_tasks_per_child=...) exists from 3.11, but on 3.11
+# it can deadlock when a worker retires while other tasks are still queued
+NATIVE_RECYCLING = sys.version_info >= (3, 12)
+
+
+def _worker_context():
+    """forkserver where available: recycled workers fork from a server that has
+    already imported the parsers, instead of spawning a fresh interpreter"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['parse_pool'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def extract_page(content, page_url, link_limit=0, extractor=None, backend=None):
+    """Parse one fetched page and return only the small extracted result.
+
+    Module-level so it can run in a worker process. Links are ranked only when
+    `link_limit` is set and the page didn't already yield an email and a phone.
+    """
+    extractor = extractor or default_extractor
+    signals = has_contact_signals(content)
+    if not signals and not link_limit:
+        # Nothing to extract and no links wanted: skip parsing entirely
+        return {'signals': False, 'size': len(content or b''), 'emails': [], 'phones': [], 'contact_links': []}
+
+    page = parse_page(content, backend)
+    emails, phones = extractor.extract_from_page(page) if signals else ([], [])
+
+    contact_links = []
+    if link_limit and not (emails and phones):
+        contact_links = rank_contact_links(page.links(), page_url, limit=link_limit)
+
+    return {
+        'signals': signals,
+        'size': len(content or b''),
+        'emails': emails,
+        'phones': phones,
+        'contact_links': contact_links
+    }
+
+
+class ParsePool:
+    """Process pool for the CPU-bound parse/extract stage.
+
+    Fetch threads hand raw page bytes to `extract`/`extract_async`; parsing and
+    regex extraction run in worker processes (outside the GIL) and only the
+    extracted emails, phones and links come back. Workers are replaced after
+    `max_tasks_per_child` pages so memory held after pathological pages is
+    returned to the OS.
+    """
+
+    def __init__(self, max_workers=None, max_tasks_per_child=500):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child
+        self._lock = threading.Lock()
+        self._executor = None
+        self._submitted_since_start = 0
+        self.stats = {'tasks': 0, 'failed': 0, 'recycled': 0}
+
+    def _get_executor(self):
+        # Caller holds self._lock
+        if self._executor is not None and not NATIVE_RECYCLING:
+            # Pythons before 3.12 can't safely recycle workers themselves: swap
+            # the whole pool once every worker has had its share of tasks
+            # (queued tasks still finish in the old pool)
+            if self._submitted_since_start >= self.max_tasks_per_child * self.max_workers:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self.stats['recycled'] += 1
+
+        if self._executor is None:
+            if NATIVE_RECYCLING:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_worker_context(),
+                                                     max_tasks_per_child=self.max_tasks_per_child)
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_worker_context())
+            self._submitted_since_start = 0
+        return self._executor
+
+    def submit(self, content, page_url, link_limit=0, extractor=None):
+        """Queue a page and return a concurrent.futures.Future for its extracted result"""
+        with self._lock:
+            executor = self._get_executor()
+            self._submitted_since_start += 1
+            self.stats['tasks'] += 1
+        # The backend is resolved here so workers follow the parent's selection
+        return executor.submit(extract_page, content, page_url, link_limit, extractor, get_backend())
+
+    def _fallback(self, content, page_url, link_limit, extractor, error):
+        # A crashed worker (e.g. killed for memory) breaks the whole pool;
+        # start a new one next time and handle this page in-process
+        logger.warning(f"Parse worker failed for {page_url}: {error}")
+        with self._lock:
+            self.stats['failed'] += 1
+            if isinstance(error, BrokenProcessPool) and self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        return extract_page(content, page_url, link_limit, extractor)
+
+    def extract(self, content, page_url, link_limit=0, extractor=None):
+        """Blocking extract for thread-based callers"""
+        try:
+            return self.submit(content, page_url, link_limit, extractor).result()
+        except Exception as e:
+            return self._fallback(content, page_url, link_limit, extractor, e)
+
+    async def extract_async(self, content, page_url, link_limit=0, extractor=None):
+        """Awaitable extract for the async fetch engine"""
+        try:
+            return await asyncio.wrap_future(self.submit(content, page_url, link_limit, extractor))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return self._fallback(content, page_url, link_limit, extractor, e)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['workers'] = self.max_workers
+        return stats
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
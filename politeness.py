@@ -0,0 +1,109 @@
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Seconds between requests to the same host. Search engines keep the average
+# of the old fixed sleeps (3-6s Google, 2-4s DuckDuckGo/ThomasNet); supplier
+# sites keep the 1s gap the deep scraper used between contact pages.
+DEFAULT_DOMAIN_DELAYS = {
+    'www.google.com': 4.5,
+    'duckduckgo.com': 3.0,
+    'html.duckduckgo.com': 3.0,
+    'www.thomasnet.com': 3.0,
+}
+
+
+class StopRequested(BaseException):
+    """Raised by DomainScheduler.acquire once the scheduler is stopped.
+
+    Derived from BaseException, like KeyboardInterrupt, so the scrapers'
+    broad `except Exception` handlers let it through instead of carrying on.
+    """
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/second, holding at most `capacity`"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait for it"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        # A negative balance means earlier callers already queued for tokens
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class DomainScheduler:
+    """Per-host politeness: spaces requests to each host, never across hosts.
+
+    Callers for the same host queue behind each other; callers for different
+    hosts never wait on one another, so work spread over many hosts runs in
+    parallel while each individual host sees the same request rate as before.
+    After stop(), waiting and new callers get StopRequested instead of a slot.
+    """
+
+    def __init__(self, default_delay=1.0, domain_delays=None, burst=1, jitter=0.25):
+        self.default_delay = default_delay
+        self.domain_delays = dict(DEFAULT_DOMAIN_DELAYS if domain_delays is None else domain_delays)
+        self.burst = burst
+        self.jitter = jitter
+        self.buckets = {}
+        self._lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.stats = {'requests': 0, 'delayed': 0, 'total_wait': 0.0}
+
+    def delay_for(self, host):
+        return self.domain_delays.get(host, self.default_delay)
+
+    def _bucket(self, host):
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(rate=1.0 / self.delay_for(host), capacity=self.burst)
+            self.buckets[host] = bucket
+        return bucket
+
+    def reserve(self, url):
+        """Reserve a slot for `url` and return the seconds to wait before sending"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            wait = self._bucket(host).reserve()
+            if wait > 0 and self.jitter:
+                wait += random.uniform(0, self.jitter * self.delay_for(host))
+            self.stats['requests'] += 1
+            if wait > 0:
+                self.stats['delayed'] += 1
+                self.stats['total_wait'] += wait
+        return wait
+
+    def acquire(self, url):
+        """Block until a request to `url`'s host is allowed"""
+        if self.stop_event.is_set():
+            raise StopRequested(url)
+        wait = self.reserve(url)
+        if wait > 0 and self.stop_event.wait(wait):
+            raise StopRequested(url)
+
+    def stop(self):
+        """End current and future waits with StopRequested (until resume())"""
+        self.stop_event.set()
+
+    def resume(self):
+        self.stop_event.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['total_wait'] = round(stats['total_wait'], 1)
+        stats['hosts'] = len(self.buckets)
+        return stats
@@ -0,0 +1,112 @@
+import json
+import queue
+import threading
+
+# Queued in place of the backlog of a subscriber that fell behind
+_RESYNC = object()
+
+
+def format_sse(event, data):
+    """One Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class ProgressBroadcaster:
+    """Pushes scraper events to every open Server-Sent Events stream.
+
+    Each stream gets its own bounded queue. An event is serialized once and
+    handed to all of them, so the cost of a progress change is one message
+    per open tab instead of one polled request per tab every few seconds.
+    A tab that stops reading loses its backlog and is sent a fresh snapshot
+    plus a 'resync' event when it catches up, rather than holding memory.
+
+    Every open stream holds a server thread, so at most `max_subscribers`
+    are served at once; the rest should be turned away (the dashboard then
+    polls) to keep threads free for ordinary requests.
+    """
+
+    def __init__(self, max_queue=256, keepalive=15.0, max_subscribers=8):
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive  # Seconds between comment lines on an idle stream
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self.stats = {'published': 0, 'delivered': 0, 'resyncs': 0, 'streams': 0, 'rejected': 0}
+
+    def is_full(self):
+        with self._lock:
+            return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self):
+        """A new subscriber queue, or None when max_subscribers streams are already open"""
+        subscriber = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.stats['rejected'] += 1
+                return None
+            self._subscribers.add(subscriber)
+            self.stats['streams'] += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event, data):
+        """Queue an event for every open stream; a no-op when nobody is listening"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        message = format_sse(event, data)
+
+        resyncs = 0
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Slow reader: drop what it hasn't read and have it reload state
+                while True:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        break
+                subscriber.put_nowait(_RESYNC)
+                resyncs += 1
+
+        with self._lock:
+            self.stats['published'] += 1
+            self.stats['delivered'] += len(subscribers) - resyncs
+            self.stats['resyncs'] += resyncs
+
+    def stream(self, snapshot):
+        """SSE text for one client: the current snapshot() as a 'progress' event, then live events"""
+        subscriber = self.subscribe()
+        if subscriber is None:
+            # Lost a race for the last slot after is_full(): end the stream,
+            # the client's reconnect then gets turned away
+            return
+        try:
+            yield f"retry: 3000\n{format_sse('progress', snapshot())}"
+            while True:
+                try:
+                    message = subscriber.get(timeout=self.keepalive)
+                except queue.Empty:
+                    # Keeps proxies from timing the stream out, and fails fast
+                    # once the client is gone so the finally below runs
+                    yield ': keepalive\n\n'
+                    continue
+                if message is _RESYNC:
+                    yield format_sse('progress', snapshot()) + format_sse('resync', {})
+                else:
+                    yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'subscribers': len(self._subscribers)}
@@ -0,0 +1,78 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """Persistent cache of parsed search results keyed by (engine, query).
+
+    Stored in a small SQLite file so resumed or repeated runs can skip the
+    search stage for queries that were already answered within `ttl` seconds.
+    """
+
+    def __init__(self, db_path='search_cache.db', ttl=7 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS search_results (
+            engine TEXT NOT NULL,
+            query TEXT NOT NULL,
+            results TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            PRIMARY KEY (engine, query)
+        )''')
+        self.conn.commit()
+
+    def get(self, engine, query):
+        """Return cached results for (engine, query), or None if missing or expired"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT results, stored_at FROM search_results WHERE engine = ? AND query = ?',
+                (engine, query)
+            ).fetchone()
+
+            if row and time.time() - row[1] <= self.ttl:
+                self.stats['hits'] += 1
+                return json.loads(row[0])
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, engine, query, results):
+        """Store parsed results; empty lists are skipped since they usually mean a block page"""
+        if not results:
+            return
+        try:
+            with self._lock:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO search_results (engine, query, results, stored_at) VALUES (?, ?, ?, ?)',
+                    (engine, query, json.dumps(results, ensure_ascii=False), time.time())
+                )
+                self.conn.commit()
+                self.stats['stores'] += 1
+        except Exception as e:
+            logger.debug(f"Search cache store failed for {engine} '{query}': {e}")
+
+    def purge_expired(self):
+        """Delete entries older than the TTL"""
+        with self._lock:
+            cursor = self.conn.execute('DELETE FROM search_results WHERE stored_at < ?', (time.time() - self.ttl,))
+            self.conn.commit()
+            return cursor.rowcount
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0
+        return stats
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,470 @@
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Applied to every connection; journal_mode=WAL is stored in the file itself
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',  # Durable at checkpoints; a crash can only lose the last commits
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-16000',  # 16 MB page cache
+    'PRAGMA recursive_triggers=ON',  # Rows removed by INSERT OR REPLACE fire the delete triggers
+)
+
+# Columns written by save_many, with the type used when migrating older files
+SUPPLIER_COLUMNS = (
+    ('company_name', 'TEXT'),
+    ('email', 'TEXT'),
+    ('phone', 'TEXT'),
+    ('website', 'TEXT'),
+    ('commodity', 'TEXT'),
+    ('source', 'TEXT'),
+    ('snippet', 'TEXT'),
+    ('quality_score', 'INTEGER DEFAULT 50'),
+)
+
+# Merge a duplicate (company_name, commodity) into the existing row instead of
+# replacing it: a non-empty contact fills an empty one, and a strictly higher
+# quality_score wins contacts, source and snippet. Rows that wouldn't change
+# aren't updated at all, so weak duplicates cost only the index lookup.
+UPSERT_SQL = '''INSERT INTO suppliers
+    (company_name, email, phone, website, commodity, source, snippet, quality_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (company_name, commodity) DO UPDATE SET
+        email = CASE WHEN COALESCE(excluded.email, '') = '' THEN suppliers.email
+                     WHEN COALESCE(suppliers.email, '') = '' OR excluded.quality_score > COALESCE(suppliers.quality_score, 0)
+                     THEN excluded.email ELSE suppliers.email END,
+        phone = CASE WHEN COALESCE(excluded.phone, '') = '' THEN suppliers.phone
+                     WHEN COALESCE(suppliers.phone, '') = '' OR excluded.quality_score > COALESCE(suppliers.quality_score, 0)
+                     THEN excluded.phone ELSE suppliers.phone END,
+        website = CASE WHEN COALESCE(excluded.website, '') = '' THEN suppliers.website
+                       WHEN COALESCE(suppliers.website, '') = '' OR excluded.quality_score > COALESCE(suppliers.quality_score, 0)
+                       THEN excluded.website ELSE suppliers.website END,
+        source = CASE WHEN excluded.quality_score > COALESCE(suppliers.quality_score, 0) THEN excluded.source ELSE suppliers.source END,
+        snippet = CASE WHEN excluded.quality_score > COALESCE(suppliers.quality_score, 0) THEN excluded.snippet ELSE suppliers.snippet END,
+        quality_score = MAX(COALESCE(suppliers.quality_score, 0), COALESCE(excluded.quality_score, 0))
+    WHERE excluded.quality_score > COALESCE(suppliers.quality_score, 0)
+        OR (COALESCE(suppliers.email, '') = '' AND COALESCE(excluded.email, '') != '')
+        OR (COALESCE(suppliers.phone, '') = '' AND COALESCE(excluded.phone, '') != '')
+        OR (COALESCE(suppliers.website, '') = '' AND COALESCE(excluded.website, '') != '')'''
+
+# Fields page() can return, where the table has them: files made by older
+# versions have date_added instead of collection_date
+RESULT_FIELDS = ('id',) + tuple(column for column, _ in SUPPLIER_COLUMNS) + ('collection_date', 'date_added')
+
+SUPPLIER_INDEXES = (
+    # (commodity, quality_score, rowid) serves commodity lookups and the
+    # best-first pages of one commodity; it replaces the plain commodity index
+    'DROP INDEX IF EXISTS idx_suppliers_commodity',
+    'CREATE INDEX IF NOT EXISTS idx_suppliers_commodity_quality ON suppliers (commodity, quality_score)',
+    'CREATE INDEX IF NOT EXISTS idx_suppliers_email ON suppliers (email)',
+    'CREATE INDEX IF NOT EXISTS idx_suppliers_quality ON suppliers (quality_score)',
+)
+
+# Running totals behind /api/stats, maintained by the triggers below so the
+# endpoint reads a handful of rows instead of scanning suppliers
+SUMMARY_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS supplier_totals (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total INTEGER NOT NULL,
+        with_email INTEGER NOT NULL,
+        with_phone INTEGER NOT NULL,
+        quality_sum INTEGER NOT NULL,
+        quality_count INTEGER NOT NULL
+    )''',
+    '''CREATE TABLE IF NOT EXISTS commodity_counts (
+        commodity TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_commodity_counts_count ON commodity_counts (count)',
+    '''CREATE TRIGGER IF NOT EXISTS suppliers_summary_insert AFTER INSERT ON suppliers BEGIN
+        UPDATE supplier_totals SET
+            total = total + 1,
+            with_email = with_email + (NEW.email IS NOT NULL AND NEW.email != ''),
+            with_phone = with_phone + (NEW.phone IS NOT NULL AND NEW.phone != ''),
+            quality_sum = quality_sum + COALESCE(NEW.quality_score, 0),
+            quality_count = quality_count + (NEW.quality_score IS NOT NULL);
+        INSERT INTO commodity_counts (commodity, count) SELECT NEW.commodity, 0
+            WHERE NOT EXISTS (SELECT 1 FROM commodity_counts WHERE commodity IS NEW.commodity);
+        UPDATE commodity_counts SET count = count + 1 WHERE commodity IS NEW.commodity;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS suppliers_summary_delete AFTER DELETE ON suppliers BEGIN
+        UPDATE supplier_totals SET
+            total = total - 1,
+            with_email = with_email - (OLD.email IS NOT NULL AND OLD.email != ''),
+            with_phone = with_phone - (OLD.phone IS NOT NULL AND OLD.phone != ''),
+            quality_sum = quality_sum - COALESCE(OLD.quality_score, 0),
+            quality_count = quality_count - (OLD.quality_score IS NOT NULL);
+        UPDATE commodity_counts SET count = count - 1 WHERE commodity IS OLD.commodity;
+        DELETE FROM commodity_counts WHERE commodity IS OLD.commodity AND count <= 0;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS suppliers_summary_update AFTER UPDATE ON suppliers BEGIN
+        UPDATE supplier_totals SET
+            with_email = with_email - (OLD.email IS NOT NULL AND OLD.email != '') + (NEW.email IS NOT NULL AND NEW.email != ''),
+            with_phone = with_phone - (OLD.phone IS NOT NULL AND OLD.phone != '') + (NEW.phone IS NOT NULL AND NEW.phone != ''),
+            quality_sum = quality_sum - COALESCE(OLD.quality_score, 0) + COALESCE(NEW.quality_score, 0),
+            quality_count = quality_count - (OLD.quality_score IS NOT NULL) + (NEW.quality_score IS NOT NULL);
+        UPDATE commodity_counts SET count = count - 1 WHERE commodity IS OLD.commodity AND OLD.commodity IS NOT NEW.commodity;
+        DELETE FROM commodity_counts WHERE commodity IS OLD.commodity AND count <= 0;
+        INSERT INTO commodity_counts (commodity, count) SELECT NEW.commodity, 0
+            WHERE OLD.commodity IS NOT NEW.commodity
+            AND NOT EXISTS (SELECT 1 FROM commodity_counts WHERE commodity IS NEW.commodity);
+        UPDATE commodity_counts SET count = count + 1 WHERE commodity IS NEW.commodity AND OLD.commodity IS NOT NEW.commodity;
+    END''',
+)
+
+
+class SupplierDB:
+    """suppliers.db shared by the scraper thread and the Flask request handlers.
+
+    Keeps one write connection and one read connection open for the life of
+    the process instead of connecting per record. In WAL mode readers see the
+    last committed state while a batch is being written, so /api/stats never
+    waits for the scraper thread.
+    """
+
+    def __init__(self, db_path='suppliers.db'):
+        self.db_path = db_path
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self.writer = self._connect()
+        self.init_schema()
+        self.reader_conn = self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def init_schema(self):
+        """Create the suppliers table, adding columns missing from files made by older versions"""
+        with self._write_lock, self.writer:
+            self.writer.execute('''CREATE TABLE IF NOT EXISTS suppliers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                company_name TEXT NOT NULL,
+                email TEXT,
+                phone TEXT,
+                website TEXT,
+                commodity TEXT NOT NULL,
+                source TEXT NOT NULL,
+                snippet TEXT,
+                quality_score INTEGER DEFAULT 50,
+                collection_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(company_name, commodity)
+            )''')
+
+            existing = {row[1] for row in self.writer.execute('PRAGMA table_info(suppliers)')}
+            for column, column_type in SUPPLIER_COLUMNS:
+                if column not in existing:
+                    self.writer.execute(f'ALTER TABLE suppliers ADD COLUMN {column} {column_type}')
+                    logger.info(f"Added missing column suppliers.{column}")
+                    existing.add(column)
+            self.result_fields = tuple(field for field in RESULT_FIELDS if field in existing)
+
+            self._ensure_unique_key()
+            for statement in SUPPLIER_INDEXES + SUMMARY_SCHEMA:
+                self.writer.execute(statement)
+
+            # First run on this file (or an older one): seed the totals from
+            # the existing rows, in the same transaction as the triggers
+            if self.writer.execute('SELECT 1 FROM supplier_totals').fetchone() is None:
+                self.rebuild_summary()
+
+    def _ensure_unique_key(self):
+        """The upsert needs a unique index on (company_name, commodity); files
+        from older versions were created without the UNIQUE constraint"""
+        for index in self.writer.execute('PRAGMA index_list(suppliers)').fetchall():
+            if index[2]:
+                columns = [row[2] for row in self.writer.execute(f'PRAGMA index_info("{index[1]}")')]
+                if columns == ['company_name', 'commodity']:
+                    return
+
+        # Keep the best-scored (then newest) row of any existing duplicates
+        removed = self.writer.execute('''DELETE FROM suppliers WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY company_name, commodity ORDER BY COALESCE(quality_score, 0) DESC, id DESC
+                ) AS rank FROM suppliers
+            ) WHERE rank = 1
+        )''').rowcount
+        if removed:
+            logger.info(f"Removed {removed} duplicate supplier rows before adding the unique key")
+        self.writer.execute('CREATE UNIQUE INDEX idx_suppliers_company_commodity ON suppliers (company_name, commodity)')
+
+    def rebuild_summary(self):
+        """Recompute the summary tables with full scans (caller holds the write transaction)"""
+        self.writer.execute('DELETE FROM supplier_totals')
+        self.writer.execute('DELETE FROM commodity_counts')
+        self.writer.execute('''INSERT INTO supplier_totals (id, total, with_email, with_phone, quality_sum, quality_count)
+            SELECT 1, COUNT(*),
+                   COALESCE(SUM(email IS NOT NULL AND email != ''), 0),
+                   COALESCE(SUM(phone IS NOT NULL AND phone != ''), 0),
+                   COALESCE(SUM(quality_score), 0),
+                   COUNT(quality_score)
+            FROM suppliers''')
+        self.writer.execute('''INSERT INTO commodity_counts (commodity, count)
+            SELECT commodity, COUNT(*) FROM suppliers GROUP BY commodity''')
+
+    def save_many(self, records):
+        """Upsert a batch of supplier records with one executemany in one transaction"""
+        rows = [
+            (record['company_name'],
+             record.get('email'),
+             record.get('phone'),
+             record.get('website'),
+             record['commodity'],
+             record['source'],
+             record.get('snippet', ''),
+             record.get('quality_score', 50))
+            for record in records
+        ]
+        if not rows:
+            return 0
+
+        with self._write_lock, self.writer:
+            self.writer.executemany(UPSERT_SQL, rows)
+        return len(rows)
+
+    def clear(self):
+        with self._write_lock, self.writer:
+            self.writer.execute('DELETE FROM suppliers')
+
+    def summary(self):
+        """Totals for /api/stats from the summary tables, independent of table size"""
+        with self.read() as c:
+            total, with_email, with_phone, quality_sum, quality_count = c.execute(
+                'SELECT total, with_email, with_phone, quality_sum, quality_count FROM supplier_totals'
+            ).fetchone()
+            top_commodities = c.execute(
+                'SELECT commodity, count FROM commodity_counts ORDER BY count DESC LIMIT 10'
+            ).fetchall()
+        return {
+            'total_records': total,
+            'with_email': with_email,
+            'with_phone': with_phone,
+            'avg_quality': round(quality_sum / quality_count, 2) if quality_count else 0,
+            'top_commodities': [{'commodity': row[0], 'count': row[1]} for row in top_commodities]
+        }
+
+    def page(self, limit=50, cursor=None, commodity=None, source=None, min_quality=None, has_email=False, fields=None):
+        """One page of suppliers, best quality_score first (newest first on ties).
+
+        Keyset pagination on (quality_score, id): the cursor names the last
+        row served and the next page starts strictly after it, so a page costs
+        one index seek at any depth and rows inserted meanwhile don't shift
+        pages. Returns {'results', 'next_cursor', 'total'}; next_cursor is None
+        on the last page, total is None when it would need a scan.
+        """
+        fields = tuple(fields) if fields else self.result_fields
+        unknown = [field for field in fields if field not in self.result_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        filters, params = [], []
+        if commodity is not None:
+            filters.append('commodity = ?')
+            params.append(commodity)
+        if source is not None:
+            filters.append('source = ?')
+            params.append(source)
+        if min_quality is not None:
+            filters.append('quality_score >= ?')
+            params.append(int(min_quality))
+        if has_email:
+            filters.append("email IS NOT NULL AND email != ''")
+
+        # The rest of the cursor's score, then lower scores, then unscored rows
+        # (last in DESC order). Each stage is a range seek on the quality index;
+        # a single (quality_score, id) < (?, ?) only seeks on quality_score and
+        # walks every tie before the cursor.
+        if cursor is None:
+            stages = [('quality_score IS NOT NULL', []), ('quality_score IS NULL', [])]
+        else:
+            quality, last_id = self._decode_cursor(cursor)
+            if quality is None:
+                stages = [('quality_score IS NULL AND id < ?', [last_id])]
+            else:
+                stages = [('quality_score = ? AND id < ?', [quality, last_id]),
+                          ('quality_score < ?', [quality]),
+                          ('quality_score IS NULL', [])]
+
+        columns = ', '.join(('id', 'quality_score') + fields)
+        rows = []
+        with self.read() as c:
+            for condition, stage_params in stages:
+                remaining = limit + 1 - len(rows)  # One extra row tells whether a next page exists
+                if remaining <= 0:
+                    break
+                where = ' AND '.join(filters + [condition])
+                rows += c.execute(
+                    f'SELECT {columns} FROM suppliers WHERE {where} ORDER BY quality_score DESC, id DESC LIMIT ?',
+                    params + stage_params + [remaining]
+                ).fetchall()
+
+            total = None
+            if source is None and min_quality is None and not has_email:
+                if commodity is None:
+                    total = c.execute('SELECT total FROM supplier_totals').fetchone()[0]
+                else:
+                    row = c.execute('SELECT count FROM commodity_counts WHERE commodity = ?', (commodity,)).fetchone()
+                    total = row[0] if row else 0
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_id, quality = rows[-1][0], rows[-1][1]
+            next_cursor = f"{'' if quality is None else quality}:{last_id}"
+        return {
+            'results': [dict(zip(fields, row[2:])) for row in rows],
+            'next_cursor': next_cursor,
+            'total': total
+        }
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            quality, last_id = cursor.split(':')
+            return (int(quality) if quality else None), int(last_id)
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    @contextmanager
+    def read(self):
+        """Cursor on the read connection, for request handlers"""
+        with self._read_lock:
+            cursor = self.reader_conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def close(self):
+        with self._write_lock:
+            self.writer.close()
+        with self._read_lock:
+            self.reader_conn.close()
+
+
+_FLUSH = object()
+_STOP = object()
+
+
+class SupplierWriter:
+    """Background thread that persists supplier records off the scraping thread.
+
+    Records go into a bounded queue and are written with SupplierDB.save_many
+    once `batch_size` have arrived or `flush_interval` seconds after the first
+    one. A full queue blocks put() (backpressure), and the time spent blocked
+    is counted so the stats show whether persistence ever held up scraping.
+    """
+
+    def __init__(self, db, batch_size=200, flush_interval=2.0, max_queue=5000):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'records': 0, 'batches': 0, 'failed': 0, 'max_depth': 0,
+            'put_wait': 0.0, 'flush_time': 0.0, 'max_flush': 0.0
+        }
+        self._closed = False
+        self.thread = threading.Thread(target=self._run, name='supplier-db-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def put_many(self, records):
+        """Queue records for writing; blocks while the queue is full"""
+        start = time.perf_counter()
+        for record in records:
+            self.queue.put(record)
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self.stats['put_wait'] += waited
+            self.stats['max_depth'] = max(self.stats['max_depth'], self.queue.qsize())
+
+    def flush(self):
+        """Write everything queued so far and wait until it is committed"""
+        if self._closed:
+            return
+        self.queue.put(_FLUSH)
+        self.queue.join()
+
+    def close(self):
+        """Flush and stop the writer thread (also run at interpreter exit)"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self.queue.put(_STOP)
+        self.thread.join(timeout=30)
+
+    def _write(self, batch):
+        start = time.perf_counter()
+        failed = 0
+        try:
+            self.db.save_many(batch)
+        except Exception as e:
+            # One bad record fails the whole executemany; retry one by one so
+            # only the records that can't be saved are lost
+            logger.warning(f"Database batch save failed ({len(batch)} records), retrying per record: {e}")
+            for record in batch:
+                try:
+                    self.db.save_many([record])
+                except Exception as e:
+                    logger.error(f"Database save error: {e}")
+                    failed += 1
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.stats['batches'] += 1
+            self.stats['records'] += len(batch) - failed
+            self.stats['failed'] += failed
+            self.stats['flush_time'] += elapsed
+            self.stats['max_flush'] = max(self.stats['max_flush'], elapsed)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _FLUSH and item is not _STOP:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            # Write on size, on timeout, or when asked to; mark the batch's
+            # items done only once committed so flush() sees them on disk
+            if batch and (item is None or item is _FLUSH or item is _STOP or len(batch) >= self.batch_size):
+                self._write(batch)
+                for _ in batch:
+                    self.queue.task_done()
+                batch = []
+                deadline = None
+
+            if item is _FLUSH or item is _STOP:
+                self.queue.task_done()
+            if item is _STOP:
+                return
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['queue_depth'] = self.queue.qsize()
+        stats['avg_flush_ms'] = round(stats['flush_time'] / stats['batches'] * 1000, 2) if stats['batches'] else 0
+        stats['max_flush_ms'] = round(stats.pop('max_flush') * 1000, 2)
+        stats['flush_time'] = round(stats['flush_time'], 3)
+        stats['put_wait'] = round(stats['put_wait'], 3)
+        return stats
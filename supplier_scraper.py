@@ -1,27 +1,76 @@
-import requests
 import pandas as pd
 import time
 import json
+import argparse
+import asyncio
+import threading
 import logging
 import re
 import os
 from datetime import datetime
-from urllib.parse import quote, urljoin
-from bs4 import BeautifulSoup
+from urllib.parse import quote
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from backup_meta import backup_meta, iter_backup_records
+from checkpoint_log import CheckpointLog
+from contact_extractor import ContactPrefilter, default_extractor
+from contact_memo import ContactMemo
+from fetch_engine import AsyncFetchEngine
+from html_parser import BACKENDS, configure_backend, find_results, is_duckduckgo_result, is_google_result, result_soup, set_backend
+from http_pool import get_shared_pool
+from parse_pool import ParsePool, extract_page
+from politeness import StopRequested
+from search_cache import SearchCache
+from url_utils import canonicalize_url, dedupe_urls, url_dedup_key
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class EnhancedSupplierScraper:
-    def __init__(self):
+    def __init__(self, max_workers=1, search_cache_ttl=7 * 24 * 3600, max_page_bytes=512 * 1024, contact_memo_file=None,
+                 parse_workers=0):
         self.collected_data = []
+        self.completed_commodities = set()
+        self.max_workers = max_workers  # Commodities processed concurrently
+        self.state_lock = threading.RLock()  # Guards collected_data, completed_commodities and checkpoint files
         self.progress_file = 'scraping_progress.json'
-        self.data_backup_file = 'supplier_data_backup.json'
+        self.data_backup_file = 'supplier_data_backup.json'  # Full-rewrite backup of older versions, read on resume
         self.checkpoint_interval = 5  # Save progress every 5 commodities
         
+        # Records are appended per commodity; checkpoints only fsync what's new
+        self.checkpoint_log = CheckpointLog('supplier_data_log.jsonl')
+        
+        # Shared keep-alive session pool for every HTTP request
+        self.http = get_shared_pool()
+        # Set on Ctrl+C: commodity workers stop at their next step and the
+        # politeness scheduler's waits (the same event) end right away
+        self.stop_event = self.http.scheduler.stop_event
+        
+        # Parsed search results keyed by (engine, query), reused across runs
+        self.search_cache = SearchCache(ttl=search_cache_ttl)
+        
+        # Deep-scraped contacts per site, shared by every commodity in the run
+        # (and across runs when contact_memo_file is set)
+        self.contact_memo = ContactMemo(contact_memo_file)
+        
+        # Deep-scrape fetches skipped because the URL was a duplicate of another result
+        self.fetches_avoided = 0
+        
+        # Pages whose raw bytes had no contact signal, so extraction was skipped
+        self.prefilter_stats = {'pages': 0, 'skipped': 0, 'bytes_skipped': 0}
+        
+        # Deep-scraped pages are streamed and cut off after this many bytes
+        self.max_page_bytes = max_page_bytes
+        
+        # Async engine for homepage/contact page fetches during deep scraping;
+        # fetch_html skips non-HTML responses and caps the body size
+        self.fetch_engine = AsyncFetchEngine(fetch_func=self.http.fetch_html, max_concurrency=16, per_host_limit=2, timeout=12)
+        
+        # Pipeline mode: fetched pages are parsed in worker processes instead
+        # of the fetching thread (0 = parse in-process)
+        self.parse_pool = ParsePool(max_workers=parse_workers) if parse_workers > 0 else None
+        
         # All 100 commodities
         self.all_commodities = [
             'Bearings', 'Cages Fitting', 'Chocolate Products', 'Custom packaging, boxes', 'Dairy Equipment',
@@ -93,37 +142,58 @@ class EnhancedSupplierScraper:
         }
         
         try:
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, ensure_ascii=False, indent=2)
+            # Written aside and renamed, so a crash never leaves a half-written file
+            tmp_path = f"{self.progress_file}.tmp"
+            with self.state_lock:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(progress, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.progress_file)
             logger.info(f"💾 Progress saved: {len(completed_commodities)}/{len(self.all_commodities)} completed")
         except Exception as e:
             logger.error(f"Failed to save progress: {e}")
     
     def backup_data(self):
-        """Backup collected data"""
-        if self.collected_data:
-            try:
-                backup_data = {
-                    'data': self.collected_data,
-                    'count': len(self.collected_data),
-                    'backup_time': datetime.now().isoformat()
-                }
-                
-                with open(self.data_backup_file, 'w', encoding='utf-8') as f:
-                    json.dump(backup_data, f, ensure_ascii=False, indent=2)
-                
-                logger.info(f"🔄 Data backed up: {len(self.collected_data)} records")
-            except Exception as e:
-                logger.error(f"Backup failed: {e}")
+        """Make the records logged since the last checkpoint durable"""
+        try:
+            self.checkpoint_log.sync()
+            log_stats = self.checkpoint_log.get_stats()
+            logger.info(f"🔄 Data backed up: {log_stats['records']} records logged this run")
+        except Exception as e:
+            logger.error(f"Backup failed: {e}")
+    
+    def replay_checkpoint_log(self):
+        """Rebuild collected data and completed commodities from the checkpoint log"""
+        try:
+            records, completed = self.checkpoint_log.replay()
+        except Exception as e:
+            logger.warning(f"Could not replay checkpoint log: {e}")
+            return False
+        
+        self.collected_data = records
+        self.completed_commodities = set(completed)
+        logger.info(f"📂 Replayed checkpoint log: {len(records)} records from {len(completed)} commodities")
+        return True
     
-    def load_backup_data(self):
-        """Load backup data if exists"""
+    def seed_checkpoint_log(self):
+        """Write the loaded backup into an empty checkpoint log, one commit per commodity"""
+        by_commodity = {commodity: [] for commodity in self.completed_commodities}
+        for record in self.collected_data:
+            by_commodity.setdefault(record.get('commodity'), []).append(record)
+        
+        for commodity, records in by_commodity.items():
+            self.checkpoint_log.append_commodity(commodity, records)
+        self.completed_commodities.update(by_commodity)
+        self.checkpoint_log.sync()
+    
+    def load_backup_data(self, commodities=None):
+        """Load the full JSON backup written by older versions, if it exists.
+        
+        The file is streamed record by record, keeping only `commodities`
+        when given, so the whole document is never held in memory.
+        """
         if os.path.exists(self.data_backup_file):
             try:
-                with open(self.data_backup_file, 'r', encoding='utf-8') as f:
-                    backup = json.load(f)
-                
-                self.collected_data = backup.get('data', [])
+                self.collected_data = list(iter_backup_records(self.data_backup_file, commodities))
                 logger.info(f"📂 Loaded backup data: {len(self.collected_data)} records")
                 return True
             except Exception as e:
@@ -146,53 +216,11 @@ class EnhancedSupplierScraper:
     
     def extract_emails_from_text(self, text):
         """Extract email addresses from text"""
-        if not text:
-            return []
-        
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-        emails = re.findall(email_pattern, text, re.IGNORECASE)
-        
-        # Filter out common non-business emails
-        filtered_emails = []
-        for email in emails:
-            email_lower = email.lower()
-            if not any(skip in email_lower for skip in [
-                'noreply', 'no-reply', 'donotreply', 'info@example', 'test@', 'admin@example',
-                'webmaster@', 'postmaster@', 'abuse@', 'privacy@example'
-            ]):
-                filtered_emails.append(email)
-        
-        return list(set(filtered_emails))  # Remove duplicates
+        return default_extractor.extract_emails(text)
     
     def extract_phones_from_text(self, text):
         """Extract phone numbers from text"""
-        if not text:
-            return []
-        
-        phone_patterns = [
-            r'\+1[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',  # US format with +1
-            r'\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',            # US without +1
-            r'[0-9]{3}-[0-9]{3}-[0-9]{4}',                               # Simple dash format
-            r'[0-9]{3}\.[0-9]{3}\.[0-9]{4}',                            # Dot format
-            r'\([0-9]{3}\)\s[0-9]{3}-[0-9]{4}',                        # (xxx) xxx-xxxx
-            r'[0-9]{10}',                                                # 10 digits
-            r'\+[0-9]{1,3}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}' # International
-        ]
-        
-        phones = []
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            phones.extend(matches)
-        
-        # Clean and validate phone numbers
-        cleaned_phones = []
-        for phone in phones:
-            # Remove non-digits except +
-            cleaned = re.sub(r'[^\d+]', '', phone)
-            if len(cleaned) >= 10:  # Valid phone should have at least 10 digits
-                cleaned_phones.append(phone.strip())
-        
-        return list(set(cleaned_phones))  # Remove duplicates
+        return default_extractor.extract_phones(text)
     
     def get_search_terms_for_commodity(self, commodity):
         """Get optimized search terms for a commodity"""
@@ -223,24 +251,28 @@ class EnhancedSupplierScraper:
         try:
             # Add location and contact info to search
             enhanced_query = f"{query} USA contact email phone address"
+            
+            cached_results = self.search_cache.get('google', enhanced_query)
+            if cached_results is not None:
+                logger.info(f"Google Search: {len(cached_results)} cached results for '{query[:50]}...'")
+                return cached_results[:max_results]
+            
             search_url = f"https://www.google.com/search?q={quote(enhanced_query)}&num={max_results}"
             
             headers = self.get_headers()
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = self.http.get(search_url, headers=headers, timeout=15)
             
             if response.status_code != 200:
                 logger.warning(f"Google search failed with status: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Only the result containers are built into the tree
+            soup = result_soup(response.content, is_google_result)
             results = []
             
-            # Find search result containers (multiple selectors for robustness)
-            search_containers = (
-                soup.find_all('div', class_='g') + 
-                soup.find_all('div', {'data-sokoban-container': True}) +
-                soup.find_all('div', class_='Gx5Zad')
-            )
+            # Find search result containers (multiple selectors for robustness),
+            # in one pass and without the blocks nested inside another result
+            search_containers = find_results(soup, is_google_result)
             
             processed_urls = set()  # Avoid duplicate URLs
             
@@ -255,12 +287,13 @@ class EnhancedSupplierScraper:
                     
                     if title_elem and link_elem:
                         title = title_elem.get_text().strip()
-                        link = link_elem.get('href', '')
+                        # Unwraps /url?q= redirects and drops tracking parameters
+                        link = canonicalize_url(link_elem.get('href', ''))
                         
                         # Skip if already processed or invalid
-                        if link in processed_urls or not link.startswith('http'):
+                        if not link or url_dedup_key(link) in processed_urls:
                             continue
-                        processed_urls.add(link)
+                        processed_urls.add(url_dedup_key(link))
                         
                         # Extract snippet
                         snippet_elem = (result.find('span', class_='aCOpRe') or 
@@ -294,6 +327,7 @@ class EnhancedSupplierScraper:
                     logger.debug(f"Error processing search result: {e}")
                     continue
             
+            self.search_cache.put('google', enhanced_query, results)
             logger.info(f"Google Search: Found {len(results)} results for '{query[:50]}...'")
             return results
             
@@ -305,23 +339,29 @@ class EnhancedSupplierScraper:
         """Enhanced DuckDuckGo search"""
         try:
             enhanced_query = f"{query} supplier manufacturer USA contact"
+            
+            cached_results = self.search_cache.get('duckduckgo', enhanced_query)
+            if cached_results is not None:
+                logger.info(f"DuckDuckGo: {len(cached_results)} cached results for '{query[:50]}...'")
+                return cached_results[:max_results]
+            
             search_url = f"https://duckduckgo.com/html/?q={quote(enhanced_query)}"
             
             headers = self.get_headers()
             # Add DuckDuckGo specific headers
             headers['Referer'] = 'https://duckduckgo.com/'
             
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = self.http.get(search_url, headers=headers, timeout=15)
             
             if response.status_code != 200:
                 logger.warning(f"DuckDuckGo search failed with status: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = result_soup(response.content, is_duckduckgo_result)
             results = []
             
             # DuckDuckGo result containers
-            search_results = soup.find_all('div', class_='result')[:max_results]
+            search_results = find_results(soup, is_duckduckgo_result)[:max_results]
             
             for result in search_results:
                 try:
@@ -330,11 +370,12 @@ class EnhancedSupplierScraper:
                     
                     if title_elem:
                         title = title_elem.get_text().strip()
-                        link = title_elem.get('href', '')
+                        # Unwraps //duckduckgo.com/l/?uddg= redirects and drops tracking parameters
+                        link = canonicalize_url(title_elem.get('href', ''))
                         snippet = snippet_elem.get_text() if snippet_elem else ''
                         
                         # Skip invalid links
-                        if not link.startswith('http'):
+                        if not link:
                             continue
                         
                         # Extract contact info
@@ -360,6 +401,7 @@ class EnhancedSupplierScraper:
                     logger.debug(f"Error processing DuckDuckGo result: {e}")
                     continue
             
+            self.search_cache.put('duckduckgo', enhanced_query, results)
             logger.info(f"DuckDuckGo: Found {len(results)} results for '{query[:50]}...'")
             return results
             
@@ -369,61 +411,78 @@ class EnhancedSupplierScraper:
     
     def scrape_website_contact_info(self, url, company_name):
         """Enhanced website contact scraping"""
+        return self.fetch_engine.run(self.scrape_website_contact_info_async, url, company_name)
+    
+    async def extract_page_async(self, content, page_url, link_limit=0):
+        """Parse a fetched page for contacts (and contact links), in the parse pool if enabled"""
+        if self.parse_pool is not None:
+            return await self.parse_pool.extract_async(content, page_url, link_limit)
+        return extract_page(content, page_url, link_limit)
+    
+    async def scrape_website_contact_info_async(self, url, company_name, prefilter=None):
+        """Scrape a website and its contact pages through the async fetch engine"""
+        _, contact_info = await self._scrape_contacts_async(url, company_name, prefilter)
+        return contact_info
+    
+    async def _scrape_contacts_async(self, url, company_name, prefilter=None):
+        """(fetched, contact info): fetched is False when the site couldn't be read
+        (network error, non-200 status), as opposed to read with no contacts on it"""
+        prefilter = prefilter or ContactPrefilter()
         try:
             if not url or not url.startswith('http'):
-                return None
+                return True, None
             
             headers = self.get_headers()
-            response = requests.get(url, headers=headers, timeout=12, allow_redirects=True)
-            
-            if response.status_code != 200:
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Get page text
-            page_text = soup.get_text()
+            response = await self.fetch_engine.fetch(url, headers=headers, timeout=12, allow_redirects=True, max_bytes=self.max_page_bytes)
             
-            # Extract basic contact info
-            emails = self.extract_emails_from_text(page_text)
-            phones = self.extract_phones_from_text(page_text)
+            if response is None or response.status_code != 200:
+                return False, None
             
-            # Look for contact page links (enhanced)
-            contact_keywords = ['contact', 'about', 'reach', 'connect', 'info', 'support']
-            contact_links = []
+            # Extract basic contact info (links, schema.org data and footer
+            # first; the full page text only if those come up empty) plus the
+            # top 3 same-site contact page candidates, /contact paths first.
+            # A page with no contact signal in its raw bytes is only used for links.
+            result = await self.extract_page_async(response.content, response.url or url, link_limit=3)
+            prefilter.record(result['signals'], result['size'])
+            emails, phones = result['emails'], result['phones']
             
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '').lower()
-                text = link.get_text().lower()
+            # Nothing left to find once the homepage has both an email and a phone
+            if not (emails and phones):
+                contact_links = result['contact_links']
                 
-                if any(keyword in href or keyword in text for keyword in contact_keywords):
-                    full_url = urljoin(url, link.get('href'))
-                    if full_url not in contact_links and full_url != url:
-                        contact_links.append(full_url)
-            
-            # Scrape contact pages (limit to top 3)
-            for contact_url in contact_links[:3]:
+                # Fetched concurrently (the engine's per-host limit keeps this
+                # gentle on the supplier's server); stop once both are found
+                pending = [
+                    asyncio.ensure_future(self.fetch_engine.fetch(contact_url, headers=headers, timeout=10, max_bytes=self.max_page_bytes))
+                    for contact_url in contact_links
+                ]
                 try:
-                    time.sleep(1)  # Be respectful
-                    contact_response = requests.get(contact_url, headers=headers, timeout=10)
-                    
-                    if contact_response.status_code == 200:
-                        contact_soup = BeautifulSoup(contact_response.content, 'html.parser')
-                        contact_text = contact_soup.get_text()
+                    for next_response in asyncio.as_completed(pending):
+                        try:
+                            contact_response = await next_response
+                            if contact_response is not None and contact_response.status_code == 200:
+                                # Extract additional contact info (contact pages
+                                # without any contact signal aren't parsed at all)
+                                contact_result = await self.extract_page_async(contact_response.content, contact_response.url)
+                                prefilter.record(contact_result['signals'], contact_result['size'])
+                                emails.extend(contact_result['emails'])
+                                phones.extend(contact_result['phones'])
                         
-                        # Extract additional contact info
-                        emails.extend(self.extract_emails_from_text(contact_text))
-                        phones.extend(self.extract_phones_from_text(contact_text))
-                
-                except Exception:
-                    continue
+                        except Exception:
+                            continue
+                        
+                        if emails and phones:
+                            break
+                finally:
+                    for task in pending:
+                        task.cancel()
             
             # Remove duplicates and clean
             emails = list(set(emails))
             phones = list(set(phones))
             
             if emails or phones:
-                return {
+                return True, {
                     'company_name': company_name,
                     'website': url,
                     'emails': emails,
@@ -431,11 +490,63 @@ class EnhancedSupplierScraper:
                     'source': 'Website Deep Scrape'
                 }
             
-            return None
+            return True, None
             
         except Exception as e:
             logger.debug(f"Error scraping website {url}: {e}")
-            return None
+            return False, None
+    
+    def deep_scrape_websites(self, websites):
+        """Deep scrape several websites concurrently, preserving input order"""
+        return [contact_info for _, contact_info in self._deep_scrape(websites)]
+    
+    def _deep_scrape(self, websites):
+        """(fetched, contact info) per website, scraped concurrently in input order"""
+        prefilter = ContactPrefilter()
+        
+        async def scrape_all():
+            return await asyncio.gather(*(
+                self._scrape_contacts_async(website, f"Contact from {website}", prefilter)
+                for website in websites
+            ))
+        
+        contact_infos = self.fetch_engine.run(scrape_all)
+        
+        stats = prefilter.get_stats()
+        if stats['skipped']:
+            logger.info(f"  🧪 Prefilter: {stats['skipped']}/{stats['pages']} pages had no contact signals ({stats['bytes_skipped'] / 1024:.0f} KB not extracted)")
+        with self.state_lock:
+            for key, value in stats.items():
+                self.prefilter_stats[key] += value
+        
+        return contact_infos
+    
+    def deep_scrape_with_memo(self, websites):
+        """Deep scrape websites not seen by earlier commodities; the rest come from the contact memo"""
+        pending = {}
+        for website in websites:
+            key = self.contact_memo.key(website)
+            if key not in pending and self.contact_memo.get(website) is None:
+                pending[key] = website
+        
+        if pending:
+            scraped = self._deep_scrape(list(pending.values()))
+            for website, (fetched, contact_info) in zip(pending.values(), scraped):
+                # Sites without contacts are memoized too so they aren't fetched
+                # again; sites that failed to load are retried next time
+                if not fetched:
+                    continue
+                self.contact_memo.put(
+                    website,
+                    contact_info['emails'] if contact_info else [],
+                    contact_info['phones'] if contact_info else []
+                )
+        
+        reused = len(websites) - len(pending)
+        if reused:
+            logger.info(f"  🧠 Reused memoized contacts for {reused}/{len(websites)} websites")
+        
+        return [self.contact_memo.contact_info(website) for website in websites]
     
     def process_search_results(self, search_results, commodity):
         """Process and enhance search results"""
@@ -500,145 +611,218 @@ class EnhancedSupplierScraper:
         
         return processed_data
     
-    def run_full_collection(self, resume_from_checkpoint=True):
-        """Run the complete 100-commodity collection"""
-        logger.info("🚀 Starting COMPLETE 100-Commodity Supplier Data Collection!")
-        logger.info("💰 100% Free - Advanced multi-source scraping")
-        
-        # Load previous progress
-        progress = self.load_progress()
-        completed_commodities = set(progress['completed_commodities']) if resume_from_checkpoint else set()
-        
-        # Load backup data if resuming
-        if resume_from_checkpoint and completed_commodities:
-            self.load_backup_data()
-            logger.info(f"🔄 Resuming from checkpoint. Already completed: {len(completed_commodities)} commodities")
-        
-        # Get remaining commodities
-        remaining_commodities = [c for c in self.all_commodities if c not in completed_commodities]
-        
-        if not remaining_commodities:
-            logger.info("🎉 All commodities already completed!")
-            return self.collected_data
+    def estimate_minutes(self, commodity_count):
+        """(low, high) minutes for a run: Google is the slowest host, 3 searches
+        per commodity at its politeness delay"""
+        google_minutes = commodity_count * 3 * self.http.scheduler.delay_for('www.google.com') / 60
+        return google_minutes, google_minutes * 1.5
+    
+    def collect_commodity(self, commodity, position=None):
+        """Run all sources for one commodity and return its processed records"""
+        logger.info(f"\n{'='*60}")
+        logger.info(f"🎯 Processing {position or ''}: {commodity}")
+        logger.info(f"{'='*60}")
         
-        logger.info(f"🎯 Processing {len(remaining_commodities)} remaining commodities...")
-        logger.info(f"📊 Expected results: {len(remaining_commodities) * 15}-{len(remaining_commodities) * 40} business contacts")
-        logger.info(f"⏱️  Estimated time: {len(remaining_commodities) * 2}-{len(remaining_commodities) * 4} minutes")
+        commodity_data = []
         
-        start_time = time.time()
+        # Get search terms for this commodity
+        search_terms = self.get_search_terms_for_commodity(commodity)
         
-        for i, commodity in enumerate(remaining_commodities, 1):
-            commodity_start_time = time.time()
-            
-            logger.info(f"\n{'='*60}")
-            logger.info(f"🎯 Processing [{i}/{len(remaining_commodities)}]: {commodity}")
-            logger.info(f"📈 Total progress: {len(completed_commodities) + i}/{len(self.all_commodities)} ({((len(completed_commodities) + i)/len(self.all_commodities)*100):.1f}%)")
-            logger.info(f"{'='*60}")
-            
-            commodity_data = []
-            
-            # Get search terms for this commodity
-            search_terms = self.get_search_terms_for_commodity(commodity)
-            
+        # Google and DuckDuckGo are different hosts, so each term queries both
+        # at once; the politeness scheduler spaces repeat requests per engine
+        with ThreadPoolExecutor(max_workers=2) as search_pool:
             for j, search_term in enumerate(search_terms, 1):
-                logger.info(f"  🔍 Search term [{j}/{len(search_terms)}]: '{search_term}'")
+                if self.stop_event.is_set():
+                    raise StopRequested(commodity)
+                logger.info(f"  🔍 [{commodity}] Search term [{j}/{len(search_terms)}]: '{search_term}'")
                 
                 # Method 1: Enhanced Google Search
+                google_future = search_pool.submit(self.scrape_google_search_results, search_term, max_results=15)
+                # Method 2: DuckDuckGo Search
+                duck_future = search_pool.submit(self.scrape_duckduckgo_search, search_term, max_results=10)
+                
                 try:
-                    google_results = self.scrape_google_search_results(search_term, max_results=15)
-                    commodity_data.extend(google_results)
-                    time.sleep(random.uniform(3, 6))  # Respectful delay
+                    commodity_data.extend(google_future.result())
                 except Exception as e:
                     logger.warning(f"  ❌ Google search failed: {e}")
                 
-                # Method 2: DuckDuckGo Search
                 try:
-                    duck_results = self.scrape_duckduckgo_search(search_term, max_results=10)
-                    commodity_data.extend(duck_results)
-                    time.sleep(random.uniform(2, 4))
+                    commodity_data.extend(duck_future.result())
                 except Exception as e:
                     logger.warning(f"  ❌ DuckDuckGo search failed: {e}")
+        
+        # Process results
+        processed_data = self.process_search_results(commodity_data, commodity)
+        
+        # Method 3: Deep website scraping
+        # The same site often comes back from several engines and search terms
+        # (http/https, www, tracking params), so it is fetched only once
+        websites_to_scrape, duplicates = dedupe_urls(
+            (item.get('website') for item in processed_data),
+            limit=8  # Limit to 8 websites per commodity
+        )
+        if duplicates:
+            logger.info(f"  🔗 [{commodity}] Skipped {duplicates} duplicate website URLs")
+            with self.state_lock:
+                self.fetches_avoided += duplicates
+        
+        if websites_to_scrape:
+            if self.stop_event.is_set():
+                raise StopRequested(commodity)
+            logger.info(f"  🌐 [{commodity}] Deep scraping {len(websites_to_scrape)} websites concurrently...")
             
-            # Process results
-            processed_data = self.process_search_results(commodity_data, commodity)
-            
-            # Method 3: Deep website scraping
-            websites_to_scrape = [
-                item.get('website') for item in processed_data 
-                if item.get('website') and item.get('website').startswith('http')
-            ][:8]  # Limit to 8 websites per commodity
-            
-            if websites_to_scrape:
-                logger.info(f"  🌐 Deep scraping {len(websites_to_scrape)} websites...")
-                
-                for k, website in enumerate(websites_to_scrape, 1):
-                    try:
-                        logger.info(f"    [{k}/{len(websites_to_scrape)}] Scraping: {website[:50]}...")
-                        
-                        contact_info = self.scrape_website_contact_info(website, f"Contact from {website}")
-                        
-                        if contact_info and (contact_info['emails'] or contact_info['phones']):
-                            # Add deep scraping results
-                            for email in contact_info['emails'][:3]:  # Max 3 emails per site
-                                deep_scrape_result = {
-                                    'company_name': contact_info['company_name'],
-                                    'email': email,
-                                    'phone': contact_info['phones'][0] if contact_info['phones'] else None,
-                                    'website': website,
-                                    'snippet': f"Deep scraped from {website}",
-                                    'commodity': commodity,
-                                    'source': 'Website Deep Scrape',
-                                    'collection_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                    'data_quality_score': 75,  # Higher score for direct scraping
-                                    'additional_emails': ', '.join(contact_info['emails'][1:]) if len(contact_info['emails']) > 1 else '',
-                                    'additional_phones': ', '.join(contact_info['phones'][1:]) if len(contact_info['phones']) > 1 else ''
-                                }
-                                processed_data.append(deep_scrape_result)
-                        
-                        time.sleep(random.uniform(2, 4))  # Be respectful
-                        
-                    except Exception as e:
-                        logger.debug(f"    ❌ Website scraping failed for {website}: {e}")
-                        continue
+            contact_infos = self.deep_scrape_with_memo(websites_to_scrape)
             
-            # Add to main collection
+            for website, contact_info in zip(websites_to_scrape, contact_infos):
+                try:
+                    if contact_info and (contact_info['emails'] or contact_info['phones']):
+                        # Add deep scraping results
+                        for email in contact_info['emails'][:3]:  # Max 3 emails per site
+                            deep_scrape_result = {
+                                'company_name': contact_info['company_name'],
+                                'email': email,
+                                'phone': contact_info['phones'][0] if contact_info['phones'] else None,
+                                'website': website,
+                                'snippet': f"Deep scraped from {website}",
+                                'commodity': commodity,
+                                'source': 'Website Deep Scrape',
+                                'collection_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                'data_quality_score': 75,  # Higher score for direct scraping
+                                'additional_emails': ', '.join(contact_info['emails'][1:]) if len(contact_info['emails']) > 1 else '',
+                                'additional_phones': ', '.join(contact_info['phones'][1:]) if len(contact_info['phones']) > 1 else ''
+                            }
+                            processed_data.append(deep_scrape_result)
+                    
+                except Exception as e:
+                    logger.debug(f"    ❌ Website scraping failed for {website}: {e}")
+                    continue
+        
+        return processed_data
+    
+    def record_commodity_result(self, commodity, processed_data, run_state):
+        """Merge a finished commodity into shared state and checkpoint if due (thread-safe)"""
+        with self.state_lock:
+            # Data first, then the completion mark, so a checkpoint never
+            # lists a commodity whose records are missing from the backup
             self.collected_data.extend(processed_data)
-            completed_commodities.add(commodity)
+            self.completed_commodities.add(commodity)
+            run_state['finished'] += 1
+            finished = run_state['finished']
             
             # Time tracking
-            commodity_time = time.time() - commodity_start_time
-            elapsed_time = time.time() - start_time
-            avg_time_per_commodity = elapsed_time / (len(completed_commodities) - progress['completed_count'])
-            remaining_time = avg_time_per_commodity * (len(remaining_commodities) - i)
+            elapsed_time = time.time() - run_state['start_time']
+            avg_time_per_commodity = elapsed_time / finished
+            remaining_time = avg_time_per_commodity * (run_state['total'] - finished)
             
-            logger.info(f"  ✅ Commodity completed: {len(processed_data)} records in {commodity_time:.1f}s")
-            logger.info(f"  📊 Running totals: {len(self.collected_data)} records from {len(completed_commodities)} commodities")
+            logger.info(f"  ✅ [{commodity}] Commodity completed: {len(processed_data)} records")
+            logger.info(f"  📈 Total progress: {len(self.completed_commodities)}/{len(self.all_commodities)} ({len(self.completed_commodities)/len(self.all_commodities)*100:.1f}%)")
+            logger.info(f"  📊 Running totals: {len(self.collected_data)} records from {len(self.completed_commodities)} commodities")
             logger.info(f"  ⏰ ETA: {remaining_time/60:.1f} minutes remaining")
             
+            # The commit marker after the records is what marks the commodity done on replay
+            self.checkpoint_log.append_commodity(commodity, processed_data)
+            
             # Checkpoint: Save progress every N commodities
-            if i % self.checkpoint_interval == 0 or i == len(remaining_commodities):
+            if finished % self.checkpoint_interval == 0 or finished == run_state['total']:
                 logger.info(f"💾 Checkpoint: Saving progress and backing up data...")
-                self.save_progress(list(completed_commodities))
                 self.backup_data()
+                self.save_progress(list(self.completed_commodities))
+                self.contact_memo.save()
+    
+    def run_full_collection(self, resume_from_checkpoint=True):
+        """Run the complete 100-commodity collection"""
+        logger.info("🚀 Starting COMPLETE 100-Commodity Supplier Data Collection!")
+        logger.info("💰 100% Free - Advanced multi-source scraping")
+        
+        # Load previous progress
+        progress = self.load_progress()
+        self.completed_commodities = set(progress['completed_commodities']) if resume_from_checkpoint else set()
+        
+        if resume_from_checkpoint and self.checkpoint_log.exists():
+            # The log holds exactly the committed commodities and their records
+            if self.replay_checkpoint_log():
+                logger.info(f"🔄 Resuming from checkpoint. Already completed: {len(self.completed_commodities)} commodities")
+        elif resume_from_checkpoint and self.completed_commodities:
+            # Progress from a version that kept the full JSON backup: carry it
+            # into the log once so later resumes replay it from there
+            self.load_backup_data(self.completed_commodities)
+            self.seed_checkpoint_log()
+            logger.info(f"🔄 Resuming from checkpoint. Already completed: {len(self.completed_commodities)} commodities")
+        elif not resume_from_checkpoint:
+            self.checkpoint_log.reset()
+        
+        # Get remaining commodities
+        remaining_commodities = [c for c in self.all_commodities if c not in self.completed_commodities]
+        
+        if not remaining_commodities:
+            logger.info("🎉 All commodities already completed!")
+            return self.collected_data
+        
+        logger.info(f"🎯 Processing {len(remaining_commodities)} remaining commodities with {self.max_workers} worker(s)...")
+        logger.info(f"📊 Expected results: {len(remaining_commodities) * 15}-{len(remaining_commodities) * 40} business contacts")
+        low, high = self.estimate_minutes(len(remaining_commodities))
+        logger.info(f"⏱️  Estimated time: {low:.0f}-{high:.0f} minutes")
+        
+        start_time = time.time()
+        run_state = {'start_time': start_time, 'total': len(remaining_commodities), 'finished': 0}
+        self.http.scheduler.resume()
+        
+        if self.max_workers <= 1:
+            for i, commodity in enumerate(remaining_commodities, 1):
+                processed_data = self.collect_commodity(commodity, f"[{i}/{len(remaining_commodities)}]")
+                self.record_commodity_result(commodity, processed_data, run_state)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='commodity')
+            try:
+                futures = {
+                    executor.submit(self.collect_commodity, commodity, f"[{i}/{len(remaining_commodities)}]"): commodity
+                    for i, commodity in enumerate(remaining_commodities, 1)
+                }
                 
-                # Quick export for safety
-                if self.collected_data:
-                    temp_df = pd.DataFrame(self.collected_data)
-                    temp_filename = f'checkpoint_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-                    temp_df.to_csv(temp_filename, index=False, encoding='utf-8')
-                    logger.info(f"🔄 Checkpoint file saved: {temp_filename}")
-            
-            # Longer delay between commodities to be respectful
-            if i < len(remaining_commodities):  # Don't delay after last commodity
-                delay = random.uniform(8, 15)
-                logger.info(f"  ⏸️  Resting for {delay:.1f} seconds...")
-                time.sleep(delay)
+                for future in as_completed(futures):
+                    commodity = futures[future]
+                    try:
+                        processed_data = future.result()
+                    except Exception as e:
+                        # Leave it out of completed_commodities so a resume retries it
+                        logger.error(f"  ❌ [{commodity}] Commodity failed: {e}")
+                        continue
+                    self.record_commodity_result(commodity, processed_data, run_state)
+            except BaseException:
+                # Ctrl+C: running commodities give up at their next request or
+                # step, so the interpreter isn't kept waiting for results that
+                # would be thrown away
+                self.http.scheduler.stop()
+                raise
+            finally:
+                # Drop queued commodities instead of finishing them
+                executor.shutdown(wait=False, cancel_futures=True)
         
         total_time = time.time() - start_time
         logger.info(f"\n🎉 COLLECTION COMPLETED!")
         logger.info(f"⏱️  Total time: {total_time/60:.1f} minutes")
         logger.info(f"📊 Total records collected: {len(self.collected_data)}")
         
+        pool_stats = self.http.get_stats()
+        politeness_stats = self.http.scheduler.get_stats()
+        logger.info(f"🚦 Politeness: {politeness_stats['delayed']}/{politeness_stats['requests']} requests waited {politeness_stats['total_wait']}s across {politeness_stats['hosts']} hosts")
+        logger.info(f"🔌 HTTP pool: {pool_stats['total_requests']} requests over {pool_stats['connections_opened']} connections (reuse rate {pool_stats['connection_reuse_rate']:.0%})")
+        search_stats = self.search_cache.get_stats()
+        logger.info(f"🔎 Search cache: {search_stats['hits']} hits, {search_stats['misses']} misses ({search_stats['hit_rate']:.0%} hit rate)")
+        logger.info(f"🔗 URL dedup: {self.fetches_avoided} duplicate deep-scrape fetches avoided")
+        logger.info(f"🧪 Prefilter: {self.prefilter_stats['skipped']}/{self.prefilter_stats['pages']} pages skipped extraction ({self.prefilter_stats['bytes_skipped'] / 1024 / 1024:.1f} MB)")
+        if self.parse_pool is not None:
+            # Workers are started again on demand if the scraper is reused
+            parse_stats = self.parse_pool.get_stats()
+            logger.info(f"⚙️  Parse pool: {parse_stats['tasks']} pages parsed by {parse_stats['workers']} worker processes ({parse_stats['failed']} fell back in-process)")
+            self.parse_pool.shutdown()
+        memo_stats = self.contact_memo.get_stats()
+        logger.info(f"🧠 Contact memo: {memo_stats['hits']} sites reused, {memo_stats['misses']} deep-scraped ({memo_stats['domains']} sites known)")
+        downloads = pool_stats['downloads']
+        logger.info(f"📦 Downloads: {downloads['bytes_read'] / 1024 / 1024:.1f} MB read, {downloads['bytes_saved'] / 1024 / 1024:.1f} MB saved ({downloads['truncated']} pages truncated, {downloads['non_html_skipped']} non-HTML skipped)")
+        cache_stats = self.http.cache.get_stats()
+        logger.info(f"🗄️  HTTP cache: {cache_stats['hits']} fresh hits, {cache_stats['revalidated']} revalidated, {cache_stats['misses']} misses ({cache_stats['local_rate']:.0%} served locally)")
+        
         return self.collected_data
     
     def export_to_excel(self, filename=None):
@@ -749,7 +933,7 @@ class EnhancedSupplierScraper:
         print(f"   • CSV Database: {filename}")
         print(f"   • Excel Database: Available via export_to_excel()")
         print(f"   • Progress File: {self.progress_file}")
-        print(f"   • Backup File: {self.data_backup_file}")
+        print(f"   • Checkpoint Log: {self.checkpoint_log.path}")
         
         print(f"\n📊 COLLECTION STATISTICS:")
         print(f"   • Total Records: {len(df):,}")
@@ -835,19 +1019,44 @@ class EnhancedSupplierScraper:
         except:
             pass
         
-        # Validate backup file
+        # Validate backup file (counts come from the .meta.json sidecar once it exists)
         try:
             if os.path.exists(self.data_backup_file):
-                with open(self.data_backup_file, 'r') as f:
-                    backup = json.load(f)
-                logger.info(f"Backup file valid: {len(backup.get('data', []))} records")
+                meta = backup_meta(self.data_backup_file)
+                logger.info(f"Backup file valid: {meta['count']} records")
         except:
             logger.warning("Backup file corrupted or invalid")
         
+        try:
+            if self.checkpoint_log.exists():
+                meta = self.checkpoint_log.meta()
+                logger.info(f"Checkpoint log valid: {meta['count']} records from {len(meta['commodities'])} commodities")
+        except:
+            logger.warning("Checkpoint log unreadable")
+        
         logger.info("✅ Cleanup completed")
 
 # Enhanced main execution with user interface
 def main():
+    parser = argparse.ArgumentParser(description='Enhanced 100-commodity supplier scraper')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of commodities to process concurrently (default: 4, 1 = sequential)')
+    parser.add_argument('--contact-memo', default=None, metavar='PATH',
+                        help='JSON file for reusing deep-scraped contacts across runs (default: this run only)')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Parse/extract fetched pages in this many worker processes (default: 0 = in the fetching thread)')
+    parser.add_argument('--parser', choices=BACKENDS, default=None,
+                        help='HTML parser backend (default: $HTML_PARSER_BACKEND or lxml; bs4 = original html.parser)')
+    args = parser.parse_args()
+    
+    if args.parser:
+        set_backend(args.parser)
+    else:
+        try:
+            configure_backend(strict=True)
+        except ValueError as e:
+            parser.error(f"$HTML_PARSER_BACKEND: {e}")
+    
     print("\n" + "="*80)
     print("🚀 ENHANCED 100-COMMODITY SUPPLIER SCRAPER")
     print("💰 100% Free - No API costs, No subscriptions!")
@@ -855,7 +1064,8 @@ def main():
     print("📊 Target: All 100 commodities with comprehensive contact data")
     print("="*80)
     
-    scraper = EnhancedSupplierScraper()
+    scraper = EnhancedSupplierScraper(max_workers=max(1, args.workers), contact_memo_file=args.contact_memo,
+                                      parse_workers=max(0, args.parse_workers))
     
     # Check for existing progress
     progress = scraper.load_progress()
@@ -864,15 +1074,18 @@ def main():
         print(f"\n🔄 RESUME DETECTED!")
         print(f"📈 Previous progress: {progress['completed_count']}/{len(scraper.all_commodities)} commodities completed")
         print(f"🗓️  Last updated: {progress.get('last_updated', 'Unknown')}")
+        if scraper.checkpoint_log.exists():
+            print(f"📦 Saved records: {scraper.checkpoint_log.meta()['count']}")
         
         choice = input("\n🤔 Do you want to RESUME from checkpoint or START FRESH? (resume/fresh): ").lower()
         resume = choice in ['resume', 'r', 'yes', 'y', '']
     else:
         print(f"\n🎯 Ready to collect data for ALL {len(scraper.all_commodities)} commodities")
         print("📊 Expected results: 2,000-5,000 business contacts")
-        print("⏱️  Estimated time: 3-6 hours (with respectful delays)")
+        low, high = scraper.estimate_minutes(len(scraper.all_commodities))
+        print(f"⏱️  Estimated time: {low:.0f}-{high:.0f} minutes (per-host rate limits)")
         print("💾 Auto-save every 5 commodities + backup system")
-        print("⚠️  Note: Includes respectful delays to avoid blocking")
+        print("⚠️  Note: Each host is rate-limited individually to avoid blocking")
         resume = False
     
     if input("\n🚀 Start collection? (y/n): ").lower() in ['y', 'yes', '']:
@@ -908,15 +1121,19 @@ def main():
         except KeyboardInterrupt:
             print(f"\n⏸️  Collection paused by user.")
             print(f"💾 Progress saved. Resume anytime by running the script again.")
-            scraper.save_progress(list(scraper.collected_data))
-            scraper.backup_data()
+            with scraper.state_lock:
+                scraper.save_progress(list(scraper.completed_commodities))
+                scraper.backup_data()
+            scraper.contact_memo.save()
             
         except Exception as e:
             print(f"\n❌ Unexpected error: {e}")
             print(f"💾 Attempting to save progress...")
             try:
-                scraper.save_progress([])
-                scraper.backup_data()
+                with scraper.state_lock:
+                    scraper.save_progress(list(scraper.completed_commodities))
+                    scraper.backup_data()
+                scraper.contact_memo.save()
             except:
                 pass
     else:
@@ -0,0 +1,132 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urljoin
+
+
+def normalize_url(url):
+    """Normalize a URL for use as a cache key (case, default ports, query order, fragment)"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+# Public suffixes with two labels that are common among supplier sites; enough
+# to avoid collapsing e.g. every *.co.uk site into "co.uk" without a PSL dependency
+MULTI_PART_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'plc.uk',
+    'com.au', 'net.au', 'org.au', 'co.nz', 'org.nz',
+    'co.in', 'net.in', 'org.in', 'co.jp', 'ne.jp', 'or.jp', 'co.kr',
+    'com.br', 'com.cn', 'com.hk', 'com.mx', 'com.sg', 'com.tw', 'com.tr',
+    'co.za', 'com.ar', 'com.co', 'com.my', 'com.ph', 'com.pk', 'com.vn',
+}
+
+
+def registrable_domain(url):
+    """Registrable domain of a URL (e.g. 'https://shop.acme.co.uk/x' -> 'acme.co.uk')"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower().rstrip('.')
+    labels = host.split('.')
+    if len(labels) == 1 or host.replace('.', '').isdigit():
+        # IPs and bare hostnames have no registrable part; keep the port apart
+        return parts.netloc.lower()
+    if len(labels) == 2:
+        return host
+    if '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src',
+    'srsltid', 'ved', 'usg', 'sa', 'ei', '_ga', '_gl', 'hsa_acc', 'hsa_cam', 'hsa_grp', 'hsa_ad',
+}
+
+
+def unwrap_redirect(url):
+    """Target of a search engine redirect link (Google /url?q=, DuckDuckGo /l/?uddg=), else the url"""
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    params = dict(parse_qsl(parts.query))
+
+    if parts.path == '/url' and (not host or 'google.' in host):
+        return params.get('q') or params.get('url') or url
+    if parts.path.startswith('/l/') and (not host or host.endswith('duckduckgo.com')) and params.get('uddg'):
+        return params['uddg']
+    return url
+
+
+def canonicalize_url(url, base=None):
+    """Canonical, fetchable form of a result link, or None if it is not an http(s) URL.
+
+    Unwraps search engine redirects, resolves scheme-relative/relative links
+    against `base`, lowercases scheme and host, drops default ports, tracking
+    parameters, fragments and trailing slashes, and sorts the query.
+    """
+    if not url:
+        return None
+    url = unwrap_redirect(url.strip())
+    if url.startswith('//'):
+        url = f"https:{url}"
+    elif base and not url.startswith(('http://', 'https://')):
+        url = urljoin(base, url)
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower().rstrip('.')
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip('/')
+    return urlunsplit((scheme, host, path or '/', query, ''))
+
+
+def url_dedup_key(url):
+    """Key under which two links count as the same page (also ignores http/https and www.)"""
+    canonical = canonicalize_url(url)
+    if canonical is None:
+        return None
+    parts = urlsplit(canonical)
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    path = parts.path if parts.path != '/' else ''
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
+
+def dedupe_urls(urls, limit=None):
+    """Unique http(s) urls in order (by dedup key), up to `limit`.
+
+    Returns (unique_urls, skipped) where `skipped` counts duplicates dropped
+    before the limit was reached, i.e. fetches the dedup avoided.
+    """
+    unique = []
+    seen = set()
+    skipped = 0
+    for url in urls:
+        if limit is not None and len(unique) >= limit:
+            break
+        key = url_dedup_key(url) if url else None
+        if key is None:
+            continue
+        if key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+        unique.append(url)
+    return unique, skipped